@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+naver_sell 파이썬 도구 통합 CLI (비대화형, 스케줄러 실행용)
+
+사용법:
+    python 01_tools/naver_cli.py profile --name bnam91 [--no-browser]
+    python 01_tools/naver_cli.py convert option_100jum.txt --base-price 10000 [-o out.json]
+    python 01_tools/naver_cli.py count json/cart_data_꾸밈.json [...]
+    python 01_tools/naver_cli.py upload data.json --db naver --collection stock [--uri ...]
+    python 01_tools/naver_cli.py serve [--port 8765] [--data-dir json] [--history ...]
+    python 01_tools/naver_cli.py bench [--runs 20] [-- count json/cart_data_꾸밈.json]
+
+무거운 모듈(selenium, bs4, pymongo, tkinter)은 해당 서브커맨드가
+실행될 때만 로드되므로 시작 시간은 인터프리터 기동 시간 수준이다.
+"""
+
+import argparse
+import sys
+
+# 통합 대상 스크립트 경로 (프로젝트 루트 기준)
+TOOL_PATHS = {
+    'profile': ('set_login', '00_set_login_naver.py'),
+    'convert': ('01_tools', '옵션을제이슨으로변환v2.py'),
+    'count': ('01_tools', 'count_option_names.py'),
+    'upload': ('01_tools', 'json_to_col.py'),
+    'serve': ('01_tools', 'stock_query_server.py'),
+}
+
+
+def load_tool(name):
+    """기존 스크립트를 모듈로 로드 (파일명에 한글/숫자가 있어 경로로 import)"""
+    import importlib.util
+    from pathlib import Path
+
+    root_dir = Path(__file__).resolve().parent.parent
+    path = root_dir.joinpath(*TOOL_PATHS[name])
+    spec = importlib.util.spec_from_file_location(f'naver_tool_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def cmd_profile(args):
+    """프로필 디렉토리 생성 및 로그인용 크롬 실행"""
+    tool = load_tool('profile')
+    tool.setup_new_login(
+        profile_name=args.name,
+        open_browser=not args.no_browser,
+        wait_for_close=True
+    )
+    return 0
+
+
+def cmd_convert(args):
+    """option.txt(HTML) -> JSON 변환"""
+    if args.base_price < 0:
+        print("오류: 가격은 0 이상이어야 합니다.")
+        return 1
+
+    tool = load_tool('convert')
+    options = tool.convert_file(args.file, args.base_price, args.output)
+    return 0 if options is not None else 1
+
+
+def cmd_count(args):
+    """cart_data JSON의 option_name 개수 및 소요 시간 통계"""
+    import json
+
+    tool = load_tool('count')
+    status = 0
+    for file_path in args.files:
+        try:
+            tool.count_file(file_path)
+        except FileNotFoundError:
+            print(f"파일을 찾을 수 없습니다: {file_path}")
+            status = 1
+        except json.JSONDecodeError:
+            print(f"JSON 파일 형식이 올바르지 않습니다: {file_path}")
+            status = 1
+    return status
+
+
+def cmd_upload(args):
+    """JSON 파일을 MongoDB 컬렉션에 업로드"""
+    tool = load_tool('upload')
+    client = None
+    try:
+        client = tool.connect(args.uri)
+        print(f"선택된 파일: {args.file}")
+        tool.upload_json(client, args.file, args.db, args.collection)
+        return 0
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        return 1
+    finally:
+        if client is not None:
+            client.close()
+            print("MongoDB 연결 종료")
+
+
+def cmd_serve(args):
+    """재고 조회 전용 로컬 HTTP 서버 실행"""
+    tool = load_tool('serve')
+    tool.serve(args.host, args.port, args.data_dir or tool.DEFAULT_DATA_DIR, args.cache_size,
+               args.history or tool.DEFAULT_HISTORY_PATH)
+    return 0
+
+
+def cmd_bench(args):
+    """CLI 시작 시간 측정 (서브프로세스로 반복 실행)"""
+    import statistics
+    import subprocess
+    import time
+
+    target = args.target or ['--help']
+    command = [sys.executable, __file__, *target]
+    baseline = [sys.executable, '-c', 'pass']
+
+    def measure(cmd):
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            samples.append((time.perf_counter() - start) * 1000)
+            if result.returncode != 0:
+                # 실패한 명령의 시간은 의미가 없으므로 측정 중단
+                output = result.stdout.decode('utf-8', errors='replace').strip()
+                print(f"오류: 명령 실행 실패 (종료 코드 {result.returncode}): {' '.join(cmd[1:])}")
+                if output:
+                    print(output[-1000:])
+                return None
+        return samples
+
+    python_ms = measure(baseline)
+    cli_ms = measure(command)
+    if python_ms is None or cli_ms is None:
+        return 1
+
+    print("=" * 50)
+    print(f"명령: {' '.join(target)} ({args.runs}회)")
+    print(f"파이썬 기동:  평균 {statistics.mean(python_ms):.1f}ms / 최소 {min(python_ms):.1f}ms")
+    print(f"CLI 실행:     평균 {statistics.mean(cli_ms):.1f}ms / 최소 {min(cli_ms):.1f}ms / 최대 {max(cli_ms):.1f}ms")
+    print(f"CLI 오버헤드: {statistics.mean(cli_ms) - statistics.mean(python_ms):.1f}ms")
+    print("=" * 50)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='naver_cli',
+        description='naver_sell 파이썬 도구 통합 CLI'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('profile', help='프로필 생성 및 로그인 브라우저 실행')
+    p.add_argument('--name', required=True, help='프로필 이름 (naver_ 접두사 자동 추가)')
+    p.add_argument('--no-browser', action='store_true', help='디렉토리와 0_naver_login.txt만 생성')
+    p.set_defaults(func=cmd_profile)
+
+    p = subparsers.add_parser('convert', help='옵션 HTML(.txt)을 JSON으로 변환')
+    p.add_argument('file', help='변환할 .txt 파일')
+    p.add_argument('--base-price', type=int, required=True, help='기본가격 (예: 10000)')
+    p.add_argument('-o', '--output', help='출력 JSON 경로 (기본: 입력 파일명.json)')
+    p.set_defaults(func=cmd_convert)
+
+    p = subparsers.add_parser('count', help='option_name 개수 및 소요 시간 계산')
+    p.add_argument('files', nargs='+', help='cart_data JSON 파일')
+    p.set_defaults(func=cmd_count)
+
+    p = subparsers.add_parser('upload', help='JSON 파일을 MongoDB에 업로드')
+    p.add_argument('file', help='업로드할 JSON 파일')
+    p.add_argument('--db', required=True, help='데이터베이스 이름')
+    p.add_argument('--collection', required=True, help='컬렉션 이름')
+    p.add_argument('--uri', help='MongoDB URI (없으면 MONGODB_URI 환경변수 필수)')
+    p.set_defaults(func=cmd_upload)
+
+    p = subparsers.add_parser('serve', help='재고 조회 전용 로컬 HTTP 서버 실행')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--data-dir', help='cart_data_*.json 폴더 (기본: 프로젝트 json 폴더)')
+    p.add_argument('--cache-size', type=int, default=1024, help='LRU 캐시 크기 (기본: 1024)')
+    p.add_argument('--history', help='실행 이력 jsonl 파일 (기본: history/stock_history.jsonl)')
+    p.set_defaults(func=cmd_serve)
+
+    p = subparsers.add_parser('bench', help='CLI 시작 시간 벤치마크')
+    p.add_argument('--runs', type=int, default=20, help='반복 횟수 (기본: 20)')
+    p.add_argument('target', nargs=argparse.REMAINDER, help='측정할 서브커맨드 (기본: --help)')
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'target', None) and args.target[0] == '--':
+        args.target = args.target[1:]
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+재고 조회 전용 로컬 HTTP 서버 (구글 시트 API 미사용)
+
+history/stock_history.jsonl (batchUpdateStocks가 실행마다 추가)과
+과거 스냅샷 json/cart_data_*.json을 한 번 읽어 메모리 인덱스로 만들고,
+최신 재고 / 기간별 이력 / 스토어 요약을 응답한다.
+응답은 LRU 캐시에 저장되며, 새 실행 결과가 이력 파일에 추가되면
+추가된 줄만 인덱스에 반영하고 캐시를 비운다.
+
+엔드포인트:
+    GET  /health
+    GET  /stock/latest?store_id=&product_id=&option_name=
+    GET  /stock/history?store_id=&product_id=&option_name=&from=&to=
+    GET  /stores                       스토어 목록
+    GET  /stores/<store_id>/summary    스토어별 요약
+    POST /reload                       강제 재로드
+
+사용법:
+    python 01_tools/stock_query_server.py [--port 8765] [--data-dir json] [--history history/stock_history.jsonl]
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# 프로젝트 루트의 json 폴더 (과거 cart_data 스냅샷)
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / 'json'
+DATA_GLOB = 'cart_data_*.json'
+
+# batchUpdateStocks가 실행마다 추가하는 재고 이력 (dbModule.js STOCK_HISTORY_PATH와 동일)
+DEFAULT_HISTORY_PATH = Path(os.environ.get(
+    'STOCK_HISTORY_PATH',
+    Path(__file__).resolve().parent.parent / 'history' / 'stock_history.jsonl'
+))
+
+# 시트 타임스탬프('2025-11-24 18:02:13')는 한국 시간
+KST = timezone(timedelta(hours=9))
+
+# 재고 값 형식: "3715 (-)", "3715 (-3)", "3715 (+11)"
+STOCK_PATTERN = re.compile(r'^\s*(\d+)\s*(?:\(([+-]?\d*)\))?')
+
+CACHE_SIZE = 1024
+RELOAD_CHECK_INTERVAL = 1.0  # 파일 변경 확인 최소 간격 (초)
+
+
+def parse_timestamp(value):
+    """ISO('...Z') 또는 한국 시간 문자열을 UTC aware datetime으로 변환 (실패 시 None)"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=KST)
+    return dt.astimezone(timezone.utc)
+
+
+def parse_stock_value(value):
+    """재고 문자열에서 (재고 수, 증감량) 추출. 증감 정보가 없으면 증감량은 None"""
+    if isinstance(value, (int, float)):
+        return int(value), None
+    match = STOCK_PATTERN.match(str(value or ''))
+    if not match:
+        return None, None
+    change = match.group(2)
+    return int(match.group(1)), (int(change) if change not in (None, '', '-', '+') else None)
+
+
+def format_timestamp(dt):
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class LRUCache:
+    """스레드 안전 LRU 캐시 (generation이 바뀌면 clear로 무효화)"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class StockIndex:
+    """재고 이력 인덱스 (cart_data JSON + 실행 이력 jsonl)"""
+
+    def __init__(self):
+        # (store_id, product_id, option_name) -> {'meta': {...}, 'times': [...], 'points': [...]}
+        self.options = {}
+        # store_id -> {'store_name': str, 'keys': [(store_id, product_id, option_name), ...] (정렬 유지)}
+        self.stores = {}
+
+    def add_point(self, meta, dt, stock, change):
+        """옵션 메타 갱신 + 시각순으로 재고 값 추가 (같은 시각이면 덮어씀)"""
+        key = (meta['store_id'], meta['product_id'], meta['option_name'])
+        store_entry = self.stores.setdefault(meta['store_id'], {'store_name': '', 'keys': []})
+        store_entry['store_name'] = meta.get('store_name') or store_entry['store_name']
+
+        entry = self.options.get(key)
+        if entry is None:
+            entry = self.options[key] = {'meta': {}, 'times': [], 'points': []}
+            bisect.insort(store_entry['keys'], key)
+        entry['meta'] = {**entry['meta'], **{k: v for k, v in meta.items() if v not in (None, '')}}
+        entry['meta']['store_name'] = store_entry['store_name']
+
+        point = {'timestamp': format_timestamp(dt), 'stock': stock, 'change': change}
+        pos = bisect.bisect_left(entry['times'], dt)
+        if pos < len(entry['times']) and entry['times'][pos] == dt:
+            entry['points'][pos] = point
+        else:
+            entry['times'].insert(pos, dt)
+            entry['points'].insert(pos, point)
+
+    def load_cart_data(self, path):
+        """cart_data_*.json (stores/products/options/stock 구조) 로드"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[재고조회] {path} 읽기 실패: {e}")
+            return
+
+        for store in data.get('stores', []):
+            for product in store.get('products', []):
+                for option in product.get('options', []):
+                    meta = {
+                        'store_id': str(store.get('store_id', '')),
+                        'store_name': store.get('store_name', ''),
+                        'product_id': str(product.get('product_id', '')),
+                        'product_name': product.get('product_name', ''),
+                        'price': product.get('price'),
+                        'option_name': str(option.get('option_name', '')),
+                        'additional_price': option.get('additional_price', 0),
+                    }
+                    for ts, value in (option.get('stock') or {}).items():
+                        dt = parse_timestamp(ts)
+                        stock, change = parse_stock_value(value)
+                        if dt is None or stock is None:
+                            continue
+                        self.add_point(meta, dt, stock, change)
+
+    def load_history_lines(self, lines):
+        """batchUpdateStocks가 남기는 실행 이력(jsonl) 줄들을 반영. 반영한 줄 수 반환"""
+        count = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            dt = parse_timestamp(record.get('timestamp'))
+            stock, change = parse_stock_value(record.get('stockValue', record.get('stock')))
+            if dt is None or stock is None:
+                continue
+            meta = {
+                'store_id': str(record.get('storeId', '')),
+                'store_name': record.get('storeName', ''),
+                'product_id': str(record.get('productId', '')),
+                'product_name': record.get('productName', ''),
+                'price': record.get('price'),
+                'option_name': str(record.get('optionName', '')),
+                'additional_price': record.get('additionalPrice'),
+            }
+            self.add_point(meta, dt, stock, change)
+            count += 1
+        return count
+
+    def find_keys(self, store_id=None, product_id=None, option_name=None):
+        """조건에 맞는 옵션 키 목록 (store_id가 있으면 스토어 인덱스 사용)"""
+        if store_id is not None:
+            candidates = self.stores.get(store_id, {}).get('keys', [])
+        else:
+            candidates = self.options.keys()
+        return [
+            key for key in candidates
+            if (product_id is None or key[1] == product_id)
+            and (option_name is None or key[2] == option_name)
+        ]
+
+    def latest(self, store_id=None, product_id=None, option_name=None):
+        results = []
+        for key in self.find_keys(store_id, product_id, option_name):
+            entry = self.options[key]
+            if not entry['points']:
+                continue
+            results.append({**entry['meta'], **entry['points'][-1]})
+        return results
+
+    def history(self, store_id=None, product_id=None, option_name=None, start=None, end=None):
+        results = []
+        for key in self.find_keys(store_id, product_id, option_name):
+            entry = self.options[key]
+            lo = bisect.bisect_left(entry['times'], start) if start else 0
+            hi = bisect.bisect_right(entry['times'], end) if end else len(entry['times'])
+            if lo >= hi:
+                continue
+            results.append({**entry['meta'], 'history': entry['points'][lo:hi]})
+        return results
+
+    def store_list(self):
+        return [
+            {'store_id': store_id, 'store_name': entry['store_name'], 'option_count': len(entry['keys'])}
+            for store_id, entry in sorted(self.stores.items())
+        ]
+
+    def store_summary(self, store_id):
+        store_entry = self.stores.get(store_id)
+        if store_entry is None:
+            return None
+
+        products = set()
+        total_stock = 0
+        sold_out = 0
+        last_updated = None
+        for key in store_entry['keys']:
+            entry = self.options[key]
+            products.add(key[1])
+            if not entry['points']:
+                continue
+            stock = entry['points'][-1]['stock']
+            total_stock += stock
+            if stock == 0:
+                sold_out += 1
+            if last_updated is None or entry['times'][-1] > last_updated:
+                last_updated = entry['times'][-1]
+
+        return {
+            'store_id': store_id,
+            'store_name': store_entry['store_name'],
+            'product_count': len(products),
+            'option_count': len(store_entry['keys']),
+            'sold_out_count': sold_out,
+            'total_stock': total_stock,
+            'last_updated': format_timestamp(last_updated) if last_updated else None,
+        }
+
+
+class StockQueryService:
+    """인덱스 + LRU 캐시 + 파일 변경 감지"""
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, cache_size=CACHE_SIZE, check_interval=RELOAD_CHECK_INTERVAL,
+                 history_path=DEFAULT_HISTORY_PATH):
+        self.data_dir = Path(data_dir)
+        self.history_path = Path(history_path)
+        self.cache = LRUCache(cache_size)
+        self.check_interval = check_interval
+        self.index = StockIndex()
+        self.generation = 0
+        self._signature = None
+        self._history_state = None  # (inode, 읽은 바이트 위치)
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reload(force=True)
+
+    def _data_files(self):
+        return sorted(self.data_dir.glob(DATA_GLOB))
+
+    def _current_signature(self):
+        signature = []
+        for path in self._data_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _read_history(self, index, offset):
+        """이력 파일의 offset 이후 완성된 줄만 반영. 새 offset 반환"""
+        try:
+            with open(self.history_path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+        except OSError:
+            return offset
+        # 쓰는 중인 마지막 줄(개행 없음)은 다음 확인 때 읽음
+        end = chunk.rfind(b'\n') + 1
+        if end > 0:
+            index.load_history_lines(chunk[:end].decode('utf-8', errors='replace').splitlines())
+        return offset + end
+
+    def _history_stat(self):
+        try:
+            stat = self.history_path.stat()
+            return stat.st_ino, stat.st_size
+        except OSError:
+            return None, 0
+
+    def reload(self, force=False):
+        """파일이 바뀌었으면 인덱스를 갱신하고 캐시 무효화. 갱신 여부 반환
+
+        cart_data 파일이 바뀌거나 이력 파일이 교체/축소되면 전체 재생성,
+        이력 파일에 줄이 추가됐으면 추가된 줄만 반영한다.
+        """
+        with self._lock:
+            signature = self._current_signature()
+            inode, size = self._history_stat()
+            self._last_check = time.monotonic()
+            history_inode, history_offset = self._history_state or (None, 0)
+
+            rebuild = force or signature != self._signature or inode != history_inode or size < history_offset
+            if not rebuild and size == history_offset:
+                return False
+
+            start = time.perf_counter()
+            if rebuild:
+                index = StockIndex()
+                for path in self._data_files():
+                    index.load_cart_data(path)
+                offset = self._read_history(index, 0) if inode is not None else 0
+                self.index = index
+            else:
+                offset = self._read_history(self.index, history_offset)
+                if offset == history_offset:
+                    return False
+
+            self._signature = signature
+            self._history_state = (inode, offset)
+            self.generation += 1
+            self.cache.clear()
+            elapsed = (time.perf_counter() - start) * 1000
+            mode = '전체 로드' if rebuild else '이력 추가 반영'
+            print(f"[재고조회] 인덱스 {mode} 완료: 파일 {len(signature)}개 + 이력 {offset}바이트, 옵션 {len(self.index.options)}개 ({elapsed:.1f}ms)")
+            return True
+
+    def maybe_reload(self):
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.reload()
+
+    def query(self, name, *args):
+        """캐시를 거쳐 인덱스 조회 (캐시 키에 generation 포함)"""
+        self.maybe_reload()
+        hit, value = self.cache.get((self.generation, name, args))
+        if hit:
+            return value
+        # 이력 추가 반영이 인덱스를 직접 수정하므로 계산은 잠금 안에서
+        with self._lock:
+            key = (self.generation, name, args)
+            value = getattr(self.index, name)(*args)
+            self.cache.put(key, value)
+        return value
+
+    def stats(self):
+        return {
+            'generation': self.generation,
+            'files': len(self._signature or ()),
+            'history_bytes': (self._history_state or (None, 0))[1],
+            'options': len(self.index.options),
+            'stores': len(self.index.stores),
+            'cache_size': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+        }
+
+
+class StockQueryHandler(BaseHTTPRequestHandler):
+    service = None  # make_server에서 주입
+
+    def log_message(self, format, *args):
+        # 요청마다 로그를 찍으면 처리량이 떨어지므로 생략
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+        parts = [p for p in parsed.path.split('/') if p]
+        service = self.service
+
+        try:
+            if parts == ['health']:
+                self._send_json(200, {'status': 'ok', **service.stats()})
+            elif parts == ['stock', 'latest']:
+                args = (params.get('store_id'), params.get('product_id'), params.get('option_name'))
+                self._send_json(200, {'results': service.query('latest', *args)})
+            elif parts == ['stock', 'history']:
+                start = parse_timestamp(params.get('from'))
+                end = parse_timestamp(params.get('to'))
+                if (params.get('from') and start is None) or (params.get('to') and end is None):
+                    self._send_json(400, {'error': 'from/to 형식이 올바르지 않습니다.'})
+                    return
+                args = (params.get('store_id'), params.get('product_id'), params.get('option_name'), start, end)
+                self._send_json(200, {'results': service.query('history', *args)})
+            elif parts == ['stores']:
+                self._send_json(200, {'results': service.query('store_list')})
+            elif len(parts) == 3 and parts[0] == 'stores' and parts[2] == 'summary':
+                summary = service.query('store_summary', parts[1])
+                if summary is None:
+                    self._send_json(404, {'error': f'스토어를 찾을 수 없습니다: {parts[1]}'})
+                else:
+                    self._send_json(200, summary)
+            else:
+                self._send_json(404, {'error': '알 수 없는 경로입니다.'})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/') == '/reload':
+            reloaded = self.service.reload(force=True)
+            self._send_json(200, {'reloaded': reloaded, **self.service.stats()})
+        else:
+            self._send_json(404, {'error': '알 수 없는 경로입니다.'})
+
+
+def make_server(host='127.0.0.1', port=8765, data_dir=DEFAULT_DATA_DIR, cache_size=CACHE_SIZE,
+                history_path=DEFAULT_HISTORY_PATH):
+    service = StockQueryService(data_dir, cache_size, history_path=history_path)
+    handler = type('BoundStockQueryHandler', (StockQueryHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host='127.0.0.1', port=8765, data_dir=DEFAULT_DATA_DIR, cache_size=CACHE_SIZE,
+          history_path=DEFAULT_HISTORY_PATH):
+    server = make_server(host, port, data_dir, cache_size, history_path)
+    print(f"[재고조회] http://{host}:{port} 에서 대기 중 (이력: {history_path}, 스냅샷: {data_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[재고조회] 종료")
+    finally:
+        server.server_close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='재고 조회 전용 로컬 HTTP 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='cart_data_*.json 폴더')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY_PATH), help='실행 이력 jsonl 파일')
+    args = parser.parse_args()
+    serve(args.host, args.port, args.data_dir, args.cache_size, args.history)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,6 @@ option.txt 파일의 HTML 옵션 데이터를 JSON으로 변환하는 스크립
 import json
 import os
 import re
-from bs4 import BeautifulSoup
 
 def extract_price(text):
     """텍스트에서 가격 정보를 추출하고 숫자로 변환"""
@@ -25,6 +24,9 @@ def extract_option_name(text):
 
 def parse_options(html_content):
     """HTML 내용을 파싱하여 옵션 리스트 반환"""
+    # BeautifulSoup은 실제 파싱할 때만 로드 (CLI 시작 시간 단축)
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
     options = []
     
@@ -106,7 +108,7 @@ def get_base_price():
 
 def extract_prefix_from_filename(filename):
     """파일명에서 접두사 추출 (예: option_100jum.txt -> 100jum)"""
-    base_name = os.path.splitext(filename)[0]
+    base_name = os.path.splitext(os.path.basename(filename))[0]
     # option_ 접두사 제거
     if base_name.startswith('option_'):
         prefix = base_name[7:]  # 'option_' 길이만큼 제거
@@ -116,18 +118,8 @@ def extract_prefix_from_filename(filename):
         prefix = base_name
     return prefix if prefix else 'option'
 
-def main():
-    """메인 함수"""
-    # 사용자가 파일 선택
-    selected_file = select_file()
-    if not selected_file:
-        return
-    
-    # 기본가격 입력받기
-    base_price = get_base_price()
-    if base_price is None:
-        return
-    
+def convert_file(selected_file, base_price, output_filename=None):
+    """선택한 .txt 파일을 변환하여 JSON으로 저장하고 옵션 리스트 반환 (실패 시 None)"""
     # 파일명에서 접두사 추출
     prefix = extract_prefix_from_filename(selected_file)
     
@@ -137,10 +129,10 @@ def main():
             html_content = f.read()
     except FileNotFoundError:
         print(f"오류: {selected_file} 파일을 찾을 수 없습니다.")
-        return
+        return None
     except Exception as e:
         print(f"오류: 파일 읽기 중 문제가 발생했습니다: {e}")
-        return
+        return None
     
     # HTML 파싱하여 옵션 추출
     options = parse_options(html_content)
@@ -158,14 +150,33 @@ def main():
     }
     
     # JSON 파일로 저장 (입력 파일명 기반으로 출력 파일명 생성)
-    base_name = os.path.splitext(selected_file)[0]
-    output_filename = f'{base_name}.json'
+    if output_filename is None:
+        base_name = os.path.splitext(selected_file)[0]
+        output_filename = f'{base_name}.json'
     try:
         with open(output_filename, 'w', encoding='utf-8') as f:
             json.dump(output, f, ensure_ascii=False, indent=2)
         print(f"성공: {len(options)}개의 옵션이 {output_filename} 파일로 저장되었습니다.")
     except Exception as e:
         print(f"오류: JSON 파일 저장 중 문제가 발생했습니다: {e}")
+        return None
+    
+    return options
+
+def main():
+    """메인 함수"""
+    # 사용자가 파일 선택
+    selected_file = select_file()
+    if not selected_file:
+        return
+    
+    # 기본가격 입력받기
+    base_price = get_base_price()
+    if base_price is None:
+        return
+    
+    options = convert_file(selected_file, base_price)
+    if options is None:
         return
     
     # 콘솔에도 출력 (선택사항)
@@ -1,4 +1,10 @@
 const { syncOptionToSheet, upsertStoreToSheet, upsertProductToSheet, batchUpsertToSheet, markDeletedOptions } = require('./sheetsModule');
+const { diffToEvents, emitEvents } = require('./eventStream');
+const fs = require('fs');
+const path = require('path');
+
+// 실행별 재고 이력 (로컬 재고 조회 서버 01_tools/stock_query_server.py가 읽음)
+const STOCK_HISTORY_PATH = process.env.STOCK_HISTORY_PATH || path.join(__dirname, 'history', 'stock_history.jsonl');
 
 // 세션 타임스탬프 (코드 실행 시작 시간으로 통일)
 let currentSessionTimestamp = null;
@@ -164,25 +170,54 @@ function setSessionTimestamp(timestamp = null) {
     return currentSessionTimestamp;
 }
 
+/**
+ * 배치 기록 결과를 이력 파일에 추가 (한 줄에 옵션 하나, 실패해도 시트 기록은 유지)
+ * @param {Array} batchItems - stockValue, timestamp가 포함된 배치 항목
+ */
+function appendStockHistory(batchItems) {
+    try {
+        fs.mkdirSync(path.dirname(STOCK_HISTORY_PATH), { recursive: true });
+        const lines = batchItems.map(item => JSON.stringify({
+            timestamp: item.timestamp,
+            storeId: String(item.storeId),
+            storeName: item.storeName || '',
+            productId: String(item.productId),
+            productName: item.productName || '',
+            price: item.price ?? null,
+            optionName: item.optionName,
+            additionalPrice: item.additionalPrice ?? null,
+            stock: item.stock,
+            stockValue: item.stockValue
+        }));
+        fs.appendFileSync(STOCK_HISTORY_PATH, lines.join('\n') + '\n');
+    } catch (e) {
+        console.error(`재고 이력 기록 중 오류: ${e.message}`);
+    }
+}
+
 /**
  * 여러 옵션을 시트에 한 번에 배치 기록
  * @param {Array} items - [{storeId, storeName, productId, productName, optionName, stock, price, additionalPrice}]
  * @param {string} timestamp - 공통 타임스탬프
+ * @param {object} options - { productScoped: true면 이번 배치에 포함된 상품만 고아행 검사 }
  */
-async function batchUpdateStocks(items, timestamp) {
+async function batchUpdateStocks(items, timestamp, options = {}) {
     try {
         if (!items || items.length === 0) return;
 
         const ts = timestamp || currentSessionTimestamp || toKoreaTime();
 
-        // 시트에서 이전 재고 읽기 (1번만)
-        const { readAllStockFromSheet } = require('./sheetsModule');
-        const previousStockMap = await readAllStockFromSheet(ts);
+        // 시트에서 이전 재고/가격 읽기 (1번만, 샤딩 시 관련 샤드만)
+        // 읽기에 실패하면 null: 기록은 계속하되 증감량과 이벤트는 만들지 않음 (전체가 신규 옵션으로 보이지 않도록)
+        const { readAllStateFromSheet } = require('./sheetsModule');
+        const previous = await readAllStateFromSheet(ts, new Set(items.map(i => String(i.storeId))));
+        const previousState = previous?.state ?? null;
+        if (previous === null) console.warn('[이벤트] 이전 상태를 읽지 못해 이번 배치는 이벤트를 건너뜁니다.');
 
         // 증감량 계산 후 배치 데이터 구성
         const batchItems = items.map(item => {
             const key = `${item.storeId}__${item.productId}__${item.optionName}`;
-            const prevStock = previousStockMap[key] ?? null;
+            const prevStock = previousState?.[key]?.stock ?? null;
 
             let stockChange = '(-)';
             if (prevStock !== null) {
@@ -199,11 +234,16 @@ async function batchUpdateStocks(items, timestamp) {
         });
 
         await batchUpsertToSheet(batchItems);
+        appendStockHistory(batchItems);
 
         // 고아행 처리: 이번 실행에서 업데이트 안 된 행에 DELETED 표기
         const storeIds = new Set(batchItems.map(i => String(i.storeId)));
         const updatedKeys = new Set(batchItems.map(i => `${i.storeId}__${i.productId}__${i.optionName}`));
-        await markDeletedOptions(storeIds, updatedKeys, ts);
+        const productIds = options.productScoped ? new Set(batchItems.map(i => String(i.productId))) : null;
+        const orphans = await markDeletedOptions(storeIds, updatedKeys, ts, productIds);
+
+        // 변경 이벤트 (품절/재입고/가격 변경/신규/사라진 옵션) 기록
+        if (previous !== null) await emitEvents(diffToEvents(previousState, items, orphans, ts, previous.columnOf));
     } catch (e) {
         console.error(`배치 재고 저장 중 오류: ${e.message}`);
         throw e;
@@ -0,0 +1,260 @@
+/**
+ * 재고 변경 이벤트 스트림
+ *
+ * batchUpdateStocks가 계산한 이전 실행 대비 차이를 타입별 이벤트로 만들어
+ * 로컬 로그(events/stock_events.jsonl, 추가 전용)에 기록하고 등록된 싱크로 전달한다.
+ *
+ * 이벤트 타입: sold_out, restocked, price_changed, additional_price_changed, new_option, vanished_option
+ * 이벤트 id는 "열__키__타입"이며 열은 배치가 기록한 시트 열의 헤더 타임스탬프(column)다.
+ * 15분 내 재실행은 같은 열을 재사용하므로 앞 실행과 같은 id가 나오고, 로그에 이미 있는 id는 다시 내보내지 않는다.
+ * 직전 열이 비어있던 옵션(사라졌다가 다시 나타난 옵션 등)이 재고와 함께 돌아오면 previous.stock이 null인 restocked.
+ *
+ * 싱크:
+ *   - 로그 파일 (항상)
+ *   - 웹훅: STOCK_EVENT_WEBHOOK_URL 환경변수 (쉼표로 여러 개)
+ *   - registerSink(async events => {...}) 로 추가
+ *
+ * 사용법: node eventStream.js tail [개수]       최근 이벤트 출력
+ *         node eventStream.js stub [포트]       웹훅 수신 테스트용 로컬 서버 (기본 8766)
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+const EVENT_LOG_PATH = process.env.STOCK_EVENT_LOG_PATH || path.join(__dirname, 'events', 'stock_events.jsonl');
+const WEBHOOK_TIMEOUT = 5000; // 웹훅 응답 대기 시간 (밀리초)
+const DEDUP_TAIL_BYTES = 1024 * 1024; // 중복 확인용으로 읽는 로그 끝부분 크기 (15분 내 재실행분이면 충분)
+
+const EVENT_TYPES = {
+    SOLD_OUT: 'sold_out',
+    RESTOCKED: 'restocked',
+    PRICE_CHANGED: 'price_changed',
+    ADDITIONAL_PRICE_CHANGED: 'additional_price_changed',
+    NEW_OPTION: 'new_option',
+    VANISHED_OPTION: 'vanished_option'
+};
+
+const sinks = [];
+
+/**
+ * 이벤트 싱크 등록
+ * @param {Function} sink - async (events) => void
+ */
+function registerSink(sink) {
+    sinks.push(sink);
+}
+
+function makeEvent(type, timestamp, column, item, previous, current) {
+    const key = `${item.storeId}__${item.productId}__${item.optionName}`;
+    return {
+        id: `${column}__${key}__${type}`,
+        type,
+        timestamp,
+        column,
+        storeId: String(item.storeId),
+        storeName: item.storeName || '',
+        productId: String(item.productId),
+        productName: item.productName || '',
+        optionName: item.optionName,
+        previous,
+        current
+    };
+}
+
+/**
+ * 이번 실행 결과와 이전 상태를 비교해 이벤트 목록 생성
+ * @param {Object<string, {stock, price, additionalPrice}>} previousState - readAllStateFromSheet 결과 (읽기 실패로 null이면 호출하지 않음)
+ * @param {Array} items - [{storeId, storeName, productId, productName, optionName, stock, price, additionalPrice}]
+ * @param {Array} orphans - markDeletedOptions 결과 (이번 실행에서 사라진 옵션)
+ * @param {string} timestamp - 이번 실행 타임스탬프
+ * @param {Function} columnOf - storeId → 이번 배치가 기록한 열의 헤더 타임스탬프 (readAllStateFromSheet 결과)
+ * @returns {Array} - 이벤트 목록
+ */
+function diffToEvents(previousState, items, orphans, timestamp, columnOf = () => timestamp) {
+    const events = [];
+
+    for (const item of items) {
+        const key = `${item.storeId}__${item.productId}__${item.optionName}`;
+        const prev = previousState[key];
+        const column = columnOf(String(item.storeId));
+
+        if (!prev) {
+            events.push(makeEvent(EVENT_TYPES.NEW_OPTION, timestamp, column, item, null, { stock: item.stock, price: item.price ?? null, additionalPrice: item.additionalPrice ?? null }));
+            continue;
+        }
+
+        if (item.stock !== null && item.stock !== undefined) {
+            if (prev.stock !== null && prev.stock > 0 && item.stock === 0) {
+                events.push(makeEvent(EVENT_TYPES.SOLD_OUT, timestamp, column, item, { stock: prev.stock }, { stock: 0 }));
+            } else if ((prev.stock === null || prev.stock === 0) && item.stock > 0) {
+                events.push(makeEvent(EVENT_TYPES.RESTOCKED, timestamp, column, item, { stock: prev.stock }, { stock: item.stock }));
+            }
+        }
+
+        if (prev.price !== null && item.price !== null && item.price !== undefined && Number(item.price) !== prev.price) {
+            events.push(makeEvent(EVENT_TYPES.PRICE_CHANGED, timestamp, column, item, { price: prev.price }, { price: Number(item.price) }));
+        }
+
+        if (prev.additionalPrice !== null && item.additionalPrice !== null && item.additionalPrice !== undefined &&
+            Number(item.additionalPrice) !== prev.additionalPrice) {
+            events.push(makeEvent(EVENT_TYPES.ADDITIONAL_PRICE_CHANGED, timestamp, column, item, { additionalPrice: prev.additionalPrice }, { additionalPrice: Number(item.additionalPrice) }));
+        }
+    }
+
+    // 직전 실행에 재고가 있던 옵션만 사라짐으로 처리 (이미 사라진 행은 매번 다시 내보내지 않음)
+    for (const orphan of orphans || []) {
+        const key = `${orphan.storeId}__${orphan.productId}__${orphan.optionName}`;
+        const prev = previousState[key];
+        if (!prev || prev.stock === null) continue;
+        events.push(makeEvent(EVENT_TYPES.VANISHED_OPTION, timestamp, columnOf(String(orphan.storeId)), orphan, { stock: prev.stock }, null));
+    }
+
+    return events;
+}
+
+/**
+ * 로그 파일에 이벤트 추가 (한 줄에 이벤트 하나)
+ */
+function appendToLog(events) {
+    fs.mkdirSync(path.dirname(EVENT_LOG_PATH), { recursive: true });
+    fs.appendFileSync(EVENT_LOG_PATH, events.map(e => JSON.stringify(e)).join('\n') + '\n');
+}
+
+/**
+ * 로그 끝부분에 이미 기록된 이벤트 id (15분 내 재실행으로 같은 열에서 다시 나온 이벤트 확인용)
+ */
+function loadRecentEventIds() {
+    const ids = new Set();
+    if (!fs.existsSync(EVENT_LOG_PATH)) return ids;
+
+    const size = fs.statSync(EVENT_LOG_PATH).size;
+    const start = Math.max(0, size - DEDUP_TAIL_BYTES);
+    const buffer = Buffer.alloc(size - start);
+    const fd = fs.openSync(EVENT_LOG_PATH, 'r');
+    try {
+        fs.readSync(fd, buffer, 0, buffer.length, start);
+    } finally {
+        fs.closeSync(fd);
+    }
+
+    const lines = buffer.toString('utf-8').split('\n');
+    if (start > 0) lines.shift(); // 잘린 첫 줄
+    for (const line of lines) {
+        if (!line) continue;
+        try {
+            ids.add(JSON.parse(line).id);
+        } catch (e) {
+            // 깨진 줄은 건너뜀
+        }
+    }
+    return ids;
+}
+
+/**
+ * 웹훅 싱크 생성 (이벤트 배열을 JSON으로 POST)
+ * @param {string} url - 웹훅 URL
+ */
+function createWebhookSink(url) {
+    return async (events) => {
+        const res = await fetch(url, {
+            method: 'POST',
+            headers: { 'content-type': 'application/json' },
+            body: JSON.stringify({ events }),
+            signal: AbortSignal.timeout(WEBHOOK_TIMEOUT)
+        });
+        if (!res.ok) throw new Error(`웹훅 응답 오류 (${url}): HTTP ${res.status}`);
+    };
+}
+
+// 환경변수로 지정한 웹훅 등록
+for (const url of (process.env.STOCK_EVENT_WEBHOOK_URL || '').split(',').map(u => u.trim()).filter(Boolean)) {
+    registerSink(createWebhookSink(url));
+}
+
+/**
+ * 이벤트 기록 및 싱크 전달 (싱크 실패는 로그만 남기고 재고 기록은 계속 진행)
+ * @param {Array} events - diffToEvents 결과
+ */
+async function emitEvents(events) {
+    if (events && events.length > 0) {
+        try {
+            const recentIds = loadRecentEventIds();
+            const fresh = events.filter(e => !recentIds.has(e.id));
+            if (fresh.length < events.length) {
+                console.log(`[이벤트] 같은 열에서 이미 기록된 이벤트 ${events.length - fresh.length}개 제외`);
+            }
+            events = fresh;
+        } catch (e) {
+            console.error(`이벤트 중복 확인 중 오류: ${e.message}`);
+        }
+    }
+
+    if (!events || events.length === 0) {
+        console.log('[이벤트] 변경 없음');
+        return;
+    }
+
+    try {
+        appendToLog(events);
+    } catch (e) {
+        console.error(`이벤트 로그 기록 중 오류: ${e.message}`);
+    }
+
+    const counts = {};
+    for (const event of events) counts[event.type] = (counts[event.type] || 0) + 1;
+    console.log(`[이벤트] ${events.length}개 기록 (${Object.entries(counts).map(([t, c]) => `${t} ${c}`).join(', ')})`);
+
+    const results = await Promise.allSettled(sinks.map(sink => sink(events)));
+    for (const result of results) {
+        if (result.status === 'rejected') {
+            console.error(`이벤트 싱크 전달 중 오류: ${result.reason?.message || result.reason}`);
+        }
+    }
+}
+
+// CLI 실행
+if (require.main === module) {
+    const [command, arg] = process.argv.slice(2);
+
+    if (command === 'stub') {
+        // 웹훅 대신 쓰는 로컬 수신 서버
+        const http = require('http');
+        const port = parseInt(arg, 10) || 8766;
+        http.createServer((req, res) => {
+            let body = '';
+            req.on('data', chunk => { body += chunk; });
+            req.on('end', () => {
+                try {
+                    const { events = [] } = JSON.parse(body || '{}');
+                    for (const e of events) {
+                        console.log(`[수신] ${e.type} | ${e.storeName} | ${e.productName} | ${e.optionName} | ${JSON.stringify(e.previous)} → ${JSON.stringify(e.current)}`);
+                    }
+                    res.writeHead(200, { 'content-type': 'application/json' });
+                    res.end(JSON.stringify({ received: events.length }));
+                } catch (e) {
+                    res.writeHead(400);
+                    res.end();
+                }
+            });
+        }).listen(port, () => {
+            console.log(`웹훅 스텁 대기 중: http://localhost:${port} (STOCK_EVENT_WEBHOOK_URL=http://localhost:${port})`);
+        });
+    } else {
+        const count = parseInt(arg, 10) || 20;
+        if (!fs.existsSync(EVENT_LOG_PATH)) {
+            console.log(`이벤트 로그 없음: ${EVENT_LOG_PATH}`);
+        } else {
+            const lines = fs.readFileSync(EVENT_LOG_PATH, 'utf-8').trim().split('\n').filter(Boolean);
+            for (const line of lines.slice(-count)) console.log(line);
+        }
+    }
+}
+
+module.exports = {
+    EVENT_TYPES,
+    EVENT_LOG_PATH,
+    diffToEvents,
+    emitEvents,
+    registerSink,
+    createWebhookSink
+};
@@ -1,5 +1,9 @@
 const { By, until, Key } = require('selenium-webdriver');
-const { addOption, updateStock } = require('./dbModule');
+const { addOption, updateStock, batchUpdateStocks } = require('./dbModule');
+
+// 네트워크 캡처 모드: 주문수정 레이어가 불러오는 GraphQL 응답을 가로챌 대상
+const CAPTURE_OPERATION = 'getCartProductModifyView';
+const CAPTURE_TIMEOUT = 5000; // 응답 대기 최대 시간 (밀리초)
 
 /**
  * 옵션 텍스트에서 추가 가격 추출
@@ -79,6 +83,52 @@ function parseOptionNameFromAlert(alertText) {
     return '';
 }
 
+/**
+ * 주문수정 레이어 X 버튼으로 닫기
+ * @param {WebDriver} driver - Selenium WebDriver 객체
+ * @param {number} waitMs - 닫기 전후 대기 시간 (밀리초)
+ */
+async function closeModifyLayer(driver, waitMs = 1500) {
+    try {
+        await driver.sleep(waitMs);
+        let closeButton = null;
+
+        // 클래스명으로 닫기 버튼 찾기
+        try {
+            const closeButtons = await driver.findElements(By.css('button.btn_close--oP6EO7PIxz'));
+            if (closeButtons.length > 0) {
+                closeButton = closeButtons[0];
+            }
+        } catch (e) {
+            // 다음 방법 시도
+        }
+
+        // data 속성으로 닫기 버튼 찾기 (예상 값)
+        if (!closeButton) {
+            try {
+                const closeButtons = await driver.findElements(By.css('button[data-shp-area-id="editclose"]'));
+                if (closeButtons.length > 0) {
+                    closeButton = closeButtons[0];
+                }
+            } catch (e) {
+                // 버튼을 찾지 못함
+            }
+        }
+
+        if (closeButton) {
+            await driver.wait(until.elementIsVisible(closeButton), 5000);
+            await closeButton.click();
+            console.log("주문수정 레이어를 X 버튼으로 닫았습니다.");
+        } else {
+            console.log("주문수정 레이어 닫기 버튼을 찾지 못했습니다.");
+        }
+
+        await driver.sleep(waitMs);
+    } catch (e) {
+        console.log(`주문수정 레이어 닫기 중 오류 발생: ${e.message}`);
+    }
+}
+
 /**
  * 주문수정 버튼 클릭 후 전체 프로세스를 처리하는 함수
  * (주문수정 버튼은 이미 클릭된 상태로 호출되어야 함)
@@ -732,54 +782,180 @@ async function processOrderModification(driver, storeId = '', productId = '', st
         }
 
         // 6. 주문수정 레이어 X 버튼으로 닫기
-        try {
-            await driver.sleep(1500);
-            let closeButton = null;
+        await closeModifyLayer(driver);
 
-            // 클래스명으로 닫기 버튼 찾기
+        // 세션 타임스탬프는 scrapeCartItems에서 관리하므로 여기서는 초기화하지 않음
+        // (전체 실행 시작 시점의 타임스탬프를 모든 스토어/상품이 공유)
+        
+        return true;
+    } catch (e) {
+        console.log(`주문수정 프로세스 중 오류 발생: ${e.message}`);
+        return false;
+    }
+}
+
+/**
+ * 페이지의 fetch / XMLHttpRequest를 감싸서 주문수정 GraphQL 응답을 기록하는 훅 설치
+ * 장바구니 페이지 로드 후(주문수정 버튼 클릭 전) 1회 호출. 이미 설치돼 있으면 무시됨.
+ * 기록된 응답은 window.__naverSellCapture 에 쌓이고 readCapturedModifyView로 꺼낸다.
+ * @param {WebDriver} driver - Selenium WebDriver 객체
+ */
+async function installNetworkCapture(driver) {
+    await driver.executeScript(function (operationName) {
+        if (window.__naverSellCapture) return;
+        window.__naverSellCapture = [];
+
+        function record(body, responseText) {
             try {
-                const closeButtons = await driver.findElements(By.css('button.btn_close--oP6EO7PIxz'));
-                if (closeButtons.length > 0) {
-                    closeButton = closeButtons[0];
-                }
+                if (typeof body !== 'string' || body.indexOf(operationName) === -1) return;
+                window.__naverSellCapture.push(responseText);
             } catch (e) {
-                // 다음 방법 시도
+                // 기록 실패는 무시 (페이지 동작에 영향 주지 않음)
             }
+        }
 
-            // data 속성으로 닫기 버튼 찾기 (예상 값)
-            if (!closeButton) {
-                try {
-                    const closeButtons = await driver.findElements(By.css('button[data-shp-area-id="editclose"]'));
-                    if (closeButtons.length > 0) {
-                        closeButton = closeButtons[0];
-                    }
-                } catch (e) {
-                    // 버튼을 찾지 못함
+        const originalFetch = window.fetch;
+        window.fetch = function (input, init) {
+            const body = init && init.body;
+            return originalFetch.apply(this, arguments).then(function (response) {
+                if (typeof body === 'string' && body.indexOf(operationName) !== -1) {
+                    response.clone().text().then(function (text) { record(body, text); }).catch(function () {});
                 }
+                return response;
+            });
+        };
+
+        const originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function (body) {
+            const xhr = this;
+            if (typeof body === 'string' && body.indexOf(operationName) !== -1) {
+                xhr.addEventListener('load', function () { record(body, xhr.responseText); });
             }
+            return originalSend.apply(this, arguments);
+        };
+    }, CAPTURE_OPERATION);
+    console.log("네트워크 캡처 훅을 설치했습니다.");
+}
 
-            if (closeButton) {
-                await driver.wait(until.elementIsVisible(closeButton), 5000);
-                await closeButton.click();
-                console.log("주문수정 레이어를 X 버튼으로 닫았습니다.");
-            } else {
-                console.log("주문수정 레이어 닫기 버튼을 찾지 못했습니다.");
+/**
+ * 캡처된 응답 중 주문수정 뷰(getCartProductModifyView) 꺼내기
+ * 훅이 없거나 제한 시간 내 응답이 없으면 null
+ * @param {WebDriver} driver - Selenium WebDriver 객체
+ * @param {string} productId - 지정하면 해당 상품 응답만 사용
+ * @param {number} timeout - 최대 대기 시간 (밀리초)
+ * @returns {Promise<object|null>} - getCartProductModifyView 객체
+ */
+async function readCapturedModifyView(driver, productId = '', timeout = CAPTURE_TIMEOUT) {
+    const deadline = Date.now() + timeout;
+
+    while (Date.now() < deadline) {
+        const captured = await driver.executeScript(function () {
+            if (!window.__naverSellCapture) return null;
+            return window.__naverSellCapture.splice(0);
+        });
+        if (captured === null) return null; // 훅 미설치
+
+        // 최신 응답부터 확인
+        for (const text of captured.reverse()) {
+            try {
+                const parsed = JSON.parse(text);
+                const payloads = Array.isArray(parsed) ? parsed : [parsed];
+                for (const payload of payloads) {
+                    const view = payload?.data?.[CAPTURE_OPERATION];
+                    if (view && (!productId || String(view.productId) === String(productId))) {
+                        return view;
+                    }
+                }
+            } catch (e) {
+                // JSON이 아닌 응답은 건너뜀
             }
+        }
 
-            await driver.sleep(1500);
-        } catch (e) {
-            console.log(`주문수정 레이어 닫기 중 오류 발생: ${e.message}`);
+        await driver.sleep(100);
+    }
+    return null;
+}
+
+/**
+ * 주문수정 뷰 응답을 옵션 단위 재고 목록으로 변환
+ * 같은 응답을 읽는 stock_api.js와 같은 시트/이벤트 키가 나오도록 매핑을 맞춘다:
+ * 옵션이 없는 상품은 option_name "", 판매 상태와 관계없이 응답의 stockQuantity 그대로 기록
+ */
+function parseModifyViewStocks(view, storeId, productId, storeName, productName, price) {
+    const resolvedStoreId = String(storeId || view.channel?.naverPaySellerNo || view.channel?.channelNo || '');
+    const resolvedStoreName = storeName || view.channel?.channelName || '';
+    const resolvedProductId = String(productId || view.productId || '');
+    const resolvedProductName = productName || view.name || '';
+    const resolvedPrice = price !== null ? price : (view.salePrice ?? null);
+    const base = { storeId: resolvedStoreId, storeName: resolvedStoreName, productId: resolvedProductId, productName: resolvedProductName, price: resolvedPrice };
+
+    const options = view.productCombinationOptions || [];
+    if (options.length === 0) {
+        return [{ ...base, optionName: '', stock: view.stockQuantity, additionalPrice: 0 }];
+    }
+    return options.map(opt => ({
+        ...base,
+        optionName: (opt.names || []).join(' / '),
+        stock: opt.stockQuantity,
+        additionalPrice: opt.optionAdditionalFee
+    }));
+}
+
+/**
+ * 네트워크 캡처 모드 주문수정 처리
+ * 옵션을 하나씩 클릭하는 대신, 레이어가 열릴 때 페이지가 받아온 옵션 JSON에서
+ * 모든 옵션 재고를 한 번에 읽는다 (상품당 레이어 1회 로드).
+ * installNetworkCapture가 버튼 클릭 전에 호출돼 있어야 하며,
+ * 응답을 잡지 못하면 기존 DOM/Alert 방식(processOrderModification)으로 대체한다.
+ *
+ * 시트 기록은 하지 않고 옵션 목록만 돌려준다. 배치 기록은 상품마다 시트 전체를 다시 읽으므로
+ * 호출하는 쪽에서 실행 전체 결과를 모아 saveNetworkStocks로 한 번만 기록한다 (stock_api.js와 같은 방식).
+ * (주문수정 버튼은 이미 클릭된 상태로 호출되어야 함)
+ * @returns {Promise<Array|null>} - 옵션 목록, 기존 방식으로 대체돼 이미 기록했으면 [], 실패하면 null
+ */
+async function processOrderModificationByNetwork(driver, storeId = '', productId = '', storeName = '', productName = '', price = null) {
+    try {
+        const view = await readCapturedModifyView(driver, productId);
+        if (!view) {
+            console.log("옵션 응답을 캡처하지 못했습니다. 기존 방식으로 진행합니다.");
+            const success = await processOrderModification(driver, storeId, productId, storeName, productName, price);
+            return success ? [] : null;
         }
 
-        // 세션 타임스탬프는 scrapeCartItems에서 관리하므로 여기서는 초기화하지 않음
-        // (전체 실행 시작 시점의 타임스탬프를 모든 스토어/상품이 공유)
-        
-        return true;
+        const items = parseModifyViewStocks(view, storeId, productId, storeName, productName, price);
+        console.log(`\n[네트워크 캡처] ${items[0].productName} - ${items.length}개 옵션`);
+        for (const item of items) {
+            console.log(`  └─ ${item.optionName}: ${item.stock}개`);
+        }
+
+        await closeModifyLayer(driver, 300);
+        return items.filter(item => item.storeId && item.productId);
     } catch (e) {
-        console.log(`주문수정 프로세스 중 오류 발생: ${e.message}`);
-        return false;
+        console.log(`네트워크 캡처 주문수정 중 오류 발생: ${e.message}`);
+        return null;
+    }
+}
+
+/**
+ * 네트워크 캡처로 모은 실행 전체 결과를 한 번의 배치로 기록
+ * 조회한 상품만 고아행 검사 대상으로 제한한다 (같은 스토어의 다른 상품을 사라짐으로 보지 않도록).
+ * @param {Array} items - processOrderModificationByNetwork 결과를 모은 배열
+ * @param {string|null} timestamp - 공유 타임스탬프
+ */
+async function saveNetworkStocks(items, timestamp = null) {
+    if (items.length === 0) return;
+    try {
+        await batchUpdateStocks(items, timestamp, { productScoped: true });
+    } catch (e) {
+        console.error(`재고 정보 저장 중 오류: ${e.message}`);
     }
 }
 
-module.exports = { processOrderModification };
+module.exports = {
+    processOrderModification,
+    processOrderModificationByNetwork,
+    saveNetworkStocks,
+    installNetworkCapture,
+    readCapturedModifyView
+};
 
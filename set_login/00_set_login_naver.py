@@ -1,15 +1,19 @@
 import os
 import shutil
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import time
 
-def setup_new_login():
+def setup_new_login(profile_name=None, open_browser=True, wait_for_close=False):
+    """프로필 생성 후 로그인용 크롬 실행
+
+    profile_name이 없으면 입력을 받고, wait_for_close가 True면 엔터 대신
+    브라우저 창이 닫힐 때까지 대기한다 (CLI 비대화형 실행용).
+    """
     # 현재 스크립트의 디렉토리 경로
     current_dir = os.path.dirname(os.path.dirname(__file__))
     
     # 프로필 이름 입력 받기
-    profile_name = input("사용할 프로필 이름을 입력하세요 (예: test): ").strip()
+    if profile_name is None:
+        profile_name = input("사용할 프로필 이름을 입력하세요 (예: test): ").strip()
     
     # naver_ 접두사 추가 (이미 있으면 제외)
     if not profile_name.startswith("naver_"):
@@ -35,6 +39,13 @@ def setup_new_login():
         os.makedirs(profile_dir)
         print(f"\n프로필 디렉토리가 생성되었습니다: {profile_dir}")
     
+    if not open_browser:
+        return profile_dir
+    
+    # selenium은 브라우저를 띄울 때만 로드
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
     # 크롬 옵션 설정
     options = Options()
     options.add_argument(f"user-data-dir={profile_dir}")
@@ -52,12 +63,23 @@ def setup_new_login():
     
     # 사용자가 브라우저를 닫을 때까지 대기
     try:
-        input("\n로그인이 완료되면 엔터키를 눌러주세요...")
+        if wait_for_close:
+            while True:
+                try:
+                    if not driver.window_handles:
+                        break
+                except Exception:
+                    break
+                time.sleep(1)
+        else:
+            input("\n로그인이 완료되면 엔터키를 눌러주세요...")
         print("\n설정이 완료되었습니다.")
     except KeyboardInterrupt:
         print("\n설정이 완료되었습니다.")
     finally:
         driver.quit()
+    
+    return profile_dir
 
 if __name__ == "__main__":
     setup_new_login() 
\ No newline at end of file
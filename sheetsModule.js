@@ -1,4 +1,5 @@
 const { google } = require('googleapis');
+const fs = require('fs');
 const path = require('path');
 const dotenv = require('dotenv');
 
@@ -22,6 +23,7 @@ const { getCredentials } = require(authPath);
 // 스프레드시트 ID (URL에서 추출)
 const SPREADSHEET_ID = '1rd5hkf7oMm8IVgGbISm6ZjHshZ74VmHor9I0VXVWNiM';
 const SHEET_NAME = 'daily_stock_';
+const DEFAULT_TARGET = { spreadsheetId: SPREADSHEET_ID, sheetName: SHEET_NAME };
 
 // 컬럼 인덱스 (0부터 시작)
 const COL_INDEX = 0;           // A열
@@ -37,7 +39,7 @@ const COL_STOCK_START = 11;    // L열 (인덱스 11)
 
 let sheets = null;
 let authClient = null;
-let sheetIdCache = null;
+let sheetIdCache = new Map(); // "spreadsheetId/sheetName" -> sheetId
 
 // 재시도 설정
 const MAX_RETRIES = 10; // 최대 재시도 횟수
@@ -115,25 +117,26 @@ async function initSheets() {
 /**
  * 시트 ID 가져오기
  */
-async function getSheetId(sheetsClient) {
-    if (sheetIdCache !== null) {
-        return sheetIdCache;
+async function getSheetId(sheetsClient, target = DEFAULT_TARGET) {
+    const cacheKey = targetKey(target);
+    if (sheetIdCache.has(cacheKey)) {
+        return sheetIdCache.get(cacheKey);
     }
     
     try {
         const response = await retryWithBackoff(async () => {
             return await sheetsClient.spreadsheets.get({
-                spreadsheetId: SPREADSHEET_ID
+                spreadsheetId: target.spreadsheetId
             });
         }, '시트 ID 가져오기');
         
-        const sheet = response.data.sheets.find(s => s.properties.title === SHEET_NAME);
+        const sheet = response.data.sheets.find(s => s.properties.title === target.sheetName);
         if (sheet) {
-            sheetIdCache = sheet.properties.sheetId;
-            return sheetIdCache;
+            sheetIdCache.set(cacheKey, sheet.properties.sheetId);
+            return sheet.properties.sheetId;
         }
         
-        throw new Error(`시트 '${SHEET_NAME}'를 찾을 수 없습니다.`);
+        throw new Error(`시트 '${target.sheetName}'를 찾을 수 없습니다.`);
     } catch (e) {
         console.error(`시트 ID 가져오기 중 오류: ${e.message}`);
         throw e;
@@ -142,20 +145,23 @@ async function getSheetId(sheetsClient) {
 
 /**
  * 시트에서 모든 데이터 읽기
+ * @param {object} target - 읽을 대상 {spreadsheetId, sheetName} (기본: daily_stock_)
+ * @param {boolean} throwOnError - true면 읽기 실패 시 빈 배열 대신 예외 (빈 시트와 구분이 필요할 때)
  */
-async function readSheetData() {
+async function readSheetData(target = DEFAULT_TARGET, throwOnError = false) {
     try {
         const sheetsClient = await initSheets();
         const response = await retryWithBackoff(async () => {
             return await sheetsClient.spreadsheets.values.get({
-                spreadsheetId: SPREADSHEET_ID,
-                range: `${SHEET_NAME}!A:ZZ`,
+                spreadsheetId: target.spreadsheetId,
+                range: `${target.sheetName}!A:ZZ`,
             });
         }, '시트 데이터 읽기');
         
         return response.data.values || [];
     } catch (e) {
         console.error(`시트 데이터 읽기 중 오류: ${e.message}`);
+        if (throwOnError) throw e;
         return [];
     }
 }
@@ -163,13 +169,13 @@ async function readSheetData() {
 /**
  * 시트의 컬럼 수 확장 (필요한 경우)
  */
-async function ensureSheetColumns(sheetsClient, requiredColumnCount) {
+async function ensureSheetColumns(sheetsClient, requiredColumnCount, target = DEFAULT_TARGET) {
     try {
-        const sheetId = await getSheetId(sheetsClient);
+        const sheetId = await getSheetId(sheetsClient, target);
         const response = await retryWithBackoff(async () => {
             return await sheetsClient.spreadsheets.get({
-                spreadsheetId: SPREADSHEET_ID,
-                ranges: [`${SHEET_NAME}!A1`],
+                spreadsheetId: target.spreadsheetId,
+                ranges: [`${target.sheetName}!A1`],
                 includeGridData: false
             });
         }, '시트 컬럼 확인');
@@ -191,7 +197,7 @@ async function ensureSheetColumns(sheetsClient, requiredColumnCount) {
             
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.batchUpdate({
-                    spreadsheetId: SPREADSHEET_ID,
+                    spreadsheetId: target.spreadsheetId,
                     resource: {
                         requests: [{
                             updateSheetProperties: {
@@ -218,10 +224,10 @@ async function ensureSheetColumns(sheetsClient, requiredColumnCount) {
 /**
  * 시트에 헤더가 있는지 확인하고 없으면 추가
  */
-async function ensureHeaders() {
+async function ensureHeaders(target = DEFAULT_TARGET) {
     try {
         const sheetsClient = await initSheets();
-        const data = await readSheetData();
+        const data = await readSheetData(target);
         
         // 헤더가 없거나 비어있으면 헤더 추가
         if (data.length === 0 || !data[0] || data[0].length === 0) {
@@ -232,8 +238,8 @@ async function ensureHeaders() {
             
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.values.update({
-                    spreadsheetId: SPREADSHEET_ID,
-                    range: `${SHEET_NAME}!A1:L1`,
+                    spreadsheetId: target.spreadsheetId,
+                    range: `${target.sheetName}!A1:L1`,
                     valueInputOption: 'RAW',
                     resource: {
                         values: [headers]
@@ -387,8 +393,9 @@ function getTimeDifferenceInMinutes(timestamp1, timestamp2) {
 /**
  * 시트의 현재 마지막 열 확인 및 필요한 열 미리 확장
  * 15분 이내면 최근 열 재사용
+ * @param {object} target - 기록 대상 {spreadsheetId, sheetName} (기본: daily_stock_)
  */
-async function ensureColumnsBeforeUpdate(sheetsClient, stockData) {
+async function ensureColumnsBeforeUpdate(sheetsClient, stockData, target = DEFAULT_TARGET) {
     try {
         // stockData가 없으면 스킵
         const stockEntries = Object.entries(stockData || {});
@@ -397,11 +404,11 @@ async function ensureColumnsBeforeUpdate(sheetsClient, stockData) {
         }
         
         // 먼저 현재 시트 상태 확인 (데이터 읽기 전)
-        const sheetId = await getSheetId(sheetsClient);
+        const sheetId = await getSheetId(sheetsClient, target);
         const response = await retryWithBackoff(async () => {
             return await sheetsClient.spreadsheets.get({
-                spreadsheetId: SPREADSHEET_ID,
-                ranges: [`${SHEET_NAME}!A1:ZZ1`], // 헤더만 읽기
+                spreadsheetId: target.spreadsheetId,
+                ranges: [`${target.sheetName}!A1:ZZ1`], // 헤더만 읽기
                 includeGridData: false
             });
         }, '열 확장 확인');
@@ -415,7 +422,7 @@ async function ensureColumnsBeforeUpdate(sheetsClient, stockData) {
         const currentColumnCount = sheet.properties.gridProperties?.columnCount || 26;
         
         // 헤더 데이터 읽기
-        const headerData = await readSheetData();
+        const headerData = await readSheetData(target);
         const headerRow = headerData[0] || [];
         
         // L열부터 사용된 마지막 컬럼과 타임스탬프 찾기
@@ -462,7 +469,7 @@ async function ensureColumnsBeforeUpdate(sheetsClient, stockData) {
             
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.batchUpdate({
-                    spreadsheetId: SPREADSHEET_ID,
+                    spreadsheetId: target.spreadsheetId,
                     resource: {
                         requests: [{
                             updateSheetProperties: {
@@ -495,20 +502,22 @@ async function ensureColumnsBeforeUpdate(sheetsClient, stockData) {
 }
 
 /**
- * 시트에 데이터 업데이트 또는 추가
+ * 시트에 데이터 업데이트 또는 추가 (샤딩 설정 시 스토어의 샤드에 기록)
  */
 async function upsertToSheet(storeId, storeName, productId, productName, price, optionName, additionalPrice, stockData) {
     try {
         const sheetsClient = await initSheets();
+        const target = resolveShard(storeId);
+        if (target !== DEFAULT_TARGET) await ensureTargetSheet(sheetsClient, target);
         
         // 헤더 확인
-        await ensureHeaders();
+        await ensureHeaders(target);
         
         // stockData가 있으면 먼저 필요한 열 확장 및 15분 이내 열 재사용 확인 (데이터 읽기 전에)
-        const columnInfo = await ensureColumnsBeforeUpdate(sheetsClient, stockData);
+        const columnInfo = await ensureColumnsBeforeUpdate(sheetsClient, stockData, target);
         
         // 기존 데이터 읽기
-        const data = await readSheetData();
+        const data = await readSheetData(target);
         
         // 행 찾기
         let rowIndex = findRowIndex(data, storeId, productId, optionName);
@@ -568,7 +577,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
                 
                 const colLetter = numberToColumnLetter(targetCol);
                 updates.push({
-                    range: `${SHEET_NAME}!${colLetter}1`,
+                    range: `${target.sheetName}!${colLetter}1`,
                     values: [[latestTimestamp]]
                 });
             } else {
@@ -608,8 +617,8 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
             // 새 행 추가
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.values.append({
-                    spreadsheetId: SPREADSHEET_ID,
-                    range: `${SHEET_NAME}!A:ZZ`,
+                    spreadsheetId: target.spreadsheetId,
+                    range: `${target.sheetName}!A:ZZ`,
                     valueInputOption: 'RAW',
                     insertDataOption: 'INSERT_ROWS',
                     resource: {
@@ -629,7 +638,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
                 formatRequests.push({
                     repeatCell: {
                         range: {
-                            sheetId: await getSheetId(sheetsClient),
+                            sheetId: await getSheetId(sheetsClient, target),
                             startRowIndex: appendedRowIndex,
                             endRowIndex: appendedRowIndex + 1,
                             startColumnIndex: stockCol,
@@ -650,7 +659,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
             if (formatRequests.length > 0) {
                 await retryWithBackoff(async () => {
                     return await sheetsClient.spreadsheets.batchUpdate({
-                        spreadsheetId: SPREADSHEET_ID,
+                        spreadsheetId: target.spreadsheetId,
                         resource: {
                             requests: formatRequests
                         }
@@ -665,28 +674,28 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
             if (storeName) {
                 const colLetter = numberToColumnLetter(COL_STORE_NAME);
                 updates.push({
-                    range: `${SHEET_NAME}!${colLetter}${rowIndex + 1}`,
+                    range: `${target.sheetName}!${colLetter}${rowIndex + 1}`,
                     values: [[String(storeName)]]
                 });
             }
             if (productName) {
                 const colLetter = numberToColumnLetter(COL_PRODUCT_NAME);
                 updates.push({
-                    range: `${SHEET_NAME}!${colLetter}${rowIndex + 1}`,
+                    range: `${target.sheetName}!${colLetter}${rowIndex + 1}`,
                     values: [[String(productName)]]
                 });
             }
             if (price !== null) {
                 const colLetter = numberToColumnLetter(COL_PRICE);
                 updates.push({
-                    range: `${SHEET_NAME}!${colLetter}${rowIndex + 1}`,
+                    range: `${target.sheetName}!${colLetter}${rowIndex + 1}`,
                     values: [[String(price)]]
                 });
             }
             if (!row[COL_ADDITIONAL_PRICE] && additionalPrice !== null) {
                 const colLetter = numberToColumnLetter(COL_ADDITIONAL_PRICE);
                 updates.push({
-                    range: `${SHEET_NAME}!${colLetter}${rowIndex + 1}`,
+                    range: `${target.sheetName}!${colLetter}${rowIndex + 1}`,
                     values: [[String(additionalPrice)]]
                 });
             }
@@ -695,7 +704,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
             const stockCol = timestampToCol[latestTimestamp];
             const colLetter = numberToColumnLetter(stockCol);
             updates.push({
-                range: `${SHEET_NAME}!${colLetter}${rowIndex + 1}`,
+                range: `${target.sheetName}!${colLetter}${rowIndex + 1}`,
                 values: [[String(latestValue)]]
             });
         }
@@ -704,7 +713,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
         if (updates.length > 0) {
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.values.batchUpdate({
-                    spreadsheetId: SPREADSHEET_ID,
+                    spreadsheetId: target.spreadsheetId,
                     resource: {
                         valueInputOption: 'RAW',
                         data: updates
@@ -723,7 +732,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
                     formatRequests.push({
                         repeatCell: {
                             range: {
-                                sheetId: await getSheetId(sheetsClient),
+                                sheetId: await getSheetId(sheetsClient, target),
                                 startRowIndex: rowIndex,
                                 endRowIndex: rowIndex + 1,
                                 startColumnIndex: stockCol,
@@ -744,7 +753,7 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
                 if (formatRequests.length > 0) {
                     await retryWithBackoff(async () => {
                         return await sheetsClient.spreadsheets.batchUpdate({
-                            spreadsheetId: SPREADSHEET_ID,
+                            spreadsheetId: target.spreadsheetId,
                             resource: {
                                 requests: formatRequests
                             }
@@ -759,14 +768,16 @@ async function upsertToSheet(storeId, storeName, productId, productName, price,
 }
 
 /**
- * 스토어 정보를 시트에 저장
+ * 스토어 정보를 시트에 저장 (샤딩 설정 시 스토어의 샤드)
  */
 async function upsertStoreToSheet(storeId, storeName) {
     try {
         const sheetsClient = await initSheets();
-        await ensureHeaders();
+        const target = resolveShard(storeId);
+        if (target !== DEFAULT_TARGET) await ensureTargetSheet(sheetsClient, target);
+        await ensureHeaders(target);
         
-        const data = await readSheetData();
+        const data = await readSheetData(target);
         
         // 해당 스토어의 모든 행 찾기 (첫 번째 행 사용)
         let rowIndex = -1;
@@ -790,7 +801,7 @@ async function upsertStoreToSheet(storeId, storeName) {
                     if (!row[COL_STORE_NAME] && storeName) {
                         const colLetter = numberToColumnLetter(COL_STORE_NAME);
                         updates.push({
-                            range: `${SHEET_NAME}!${colLetter}${i + 1}`,
+                            range: `${target.sheetName}!${colLetter}${i + 1}`,
                             values: [[String(storeName)]]
                         });
                     }
@@ -800,7 +811,7 @@ async function upsertStoreToSheet(storeId, storeName) {
             if (updates.length > 0) {
                 await retryWithBackoff(async () => {
                     return await sheetsClient.spreadsheets.values.batchUpdate({
-                        spreadsheetId: SPREADSHEET_ID,
+                        spreadsheetId: target.spreadsheetId,
                         resource: {
                             valueInputOption: 'RAW',
                             data: updates
@@ -815,14 +826,16 @@ async function upsertStoreToSheet(storeId, storeName) {
 }
 
 /**
- * 상품 정보를 시트에 저장
+ * 상품 정보를 시트에 저장 (샤딩 설정 시 스토어의 샤드)
  */
 async function upsertProductToSheet(storeId, productId, productName, price) {
     try {
         const sheetsClient = await initSheets();
-        await ensureHeaders();
+        const target = resolveShard(storeId);
+        if (target !== DEFAULT_TARGET) await ensureTargetSheet(sheetsClient, target);
+        await ensureHeaders(target);
         
-        const data = await readSheetData();
+        const data = await readSheetData(target);
         
         // 해당 상품의 모든 행 찾기 (모든 옵션 행에 업데이트)
         const updates = [];
@@ -835,14 +848,14 @@ async function upsertProductToSheet(storeId, productId, productName, price) {
                 if (!row[COL_PRODUCT_NAME] && productName) {
                     const colLetter = numberToColumnLetter(COL_PRODUCT_NAME);
                     updates.push({
-                        range: `${SHEET_NAME}!${colLetter}${i + 1}`,
+                        range: `${target.sheetName}!${colLetter}${i + 1}`,
                         values: [[String(productName)]]
                     });
                 }
                 if (!row[COL_PRICE] && price !== null) {
                     const colLetter = numberToColumnLetter(COL_PRICE);
                     updates.push({
-                        range: `${SHEET_NAME}!${colLetter}${i + 1}`,
+                        range: `${target.sheetName}!${colLetter}${i + 1}`,
                         values: [[String(price)]]
                     });
                 }
@@ -852,7 +865,7 @@ async function upsertProductToSheet(storeId, productId, productName, price) {
         if (updates.length > 0) {
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.values.batchUpdate({
-                    spreadsheetId: SPREADSHEET_ID,
+                    spreadsheetId: target.spreadsheetId,
                     resource: {
                         valueInputOption: 'RAW',
                         data: updates
@@ -866,12 +879,13 @@ async function upsertProductToSheet(storeId, productId, productName, price) {
 }
 
 /**
- * 시트에서 특정 옵션의 이전 재고 정보 읽기
+ * 시트에서 특정 옵션의 이전 재고 정보 읽기 (샤딩 설정 시 스토어의 샤드)
  */
 async function readStockFromSheet(storeId, productId, optionName, currentTimestamp = null) {
     try {
         const sheetsClient = await initSheets();
-        const data = await readSheetData();
+        const target = resolveShard(storeId);
+        const data = await readSheetData(target);
         
         const rowIndex = findRowIndex(data, storeId, productId, optionName);
         if (rowIndex === -1) {
@@ -997,14 +1011,27 @@ async function syncOptionToSheet(storeId, storeName, productId, productName, pri
 }
 
 /**
- * 전체 시트에서 최근 재고 값을 한 번에 읽어 map으로 반환
- * key: "storeId__productId__optionName", value: 숫자 재고
+ * 셀 값을 숫자로 변환 (빈 값이면 null)
+ */
+function parseNumberCell(value) {
+    if (value === undefined || value === null || value === '') return null;
+    const num = parseInt(String(value).replace(/,/g, ''), 10);
+    return Number.isNaN(num) ? null : num;
+}
+
+/**
+ * 전체 시트에서 행별 이전 상태(최근 재고, 가격, 추가가격)를 한 번에 읽어 map으로 반환
+ * key: "storeId__productId__optionName", value: { stock, price, additionalPrice }
+ * 이전 열에 재고 값이 없는 행은 stock이 null
+ * column은 이번 배치가 기록할 열의 헤더 타임스탬프 (15분 이내 재실행이면 재사용되는 열, 아니면 currentTimestamp)
  * @param {string} currentTimestamp - 현재 타임스탬프 (15분 이내 열 판별용)
+ * @param {object} target - 기록 대상 {spreadsheetId, sheetName} (기본: daily_stock_)
+ * @returns {Promise<{state: Object, column: string|null}|null>} - 읽기 실패 시 null (빈 시트는 state {})
  */
-async function readAllStockFromSheet(currentTimestamp = null) {
+async function readAllStateFromTarget(currentTimestamp = null, target = DEFAULT_TARGET) {
     try {
-        const data = await readSheetData();
-        if (data.length < 2) return {};
+        const data = await readSheetData(target, true);
+        if (data.length < 2) return { state: {}, column: currentTimestamp };
 
         const headerRow = data[0] || [];
         const result = {};
@@ -1016,13 +1043,17 @@ async function readAllStockFromSheet(currentTimestamp = null) {
         }
         timestampCols.sort((a, b) => parseKoreaTime(b.ts) - parseKoreaTime(a.ts));
 
-        if (timestampCols.length === 0) return {};
-
         // 현재 타임스탬프 기준 이전 열 결정
         let prevCol = null;
+        let reusedCol = null;
+        let column = currentTimestamp;
         if (currentTimestamp && timestampCols.length > 0) {
             const latest = timestampCols[0];
             const diff = getTimeDifferenceInMinutes(latest.ts, currentTimestamp);
+            if (diff <= 15) {
+                reusedCol = latest.col;
+                column = latest.ts;
+            }
             // 15분 이내면 그 열이 덮어씌워질 예정이므로 두 번째 열이 이전 기준
             if (diff <= 15 && timestampCols.length > 1) {
                 prevCol = timestampCols[1].col;
@@ -1032,42 +1063,48 @@ async function readAllStockFromSheet(currentTimestamp = null) {
         } else if (timestampCols.length > 0) {
             prevCol = timestampCols[0].col;
         }
+        const olderCols = timestampCols.filter(c => c.col !== reusedCol).map(c => c.col);
 
-        if (prevCol === null) return {};
-
+        // 재고 열이 아직 없어도 행은 이미 있으므로 stock null로 채움 (신규 옵션으로 보지 않도록)
         for (let row = 1; row < data.length; row++) {
             const r = data[row];
             if (!r) continue;
             const storeId = r[COL_STORE_ID] || '';
             const productId = r[COL_PRODUCT_ID] || '';
             const optionName = r[COL_OPTION_NAME] || '';
-            const stockStr = r[prevCol] || '';
+            // 재사용 열에서 처음 생긴 행은 직전 실행이 추가한 신규 옵션이므로 이전 상태에서 제외
+            // (재실행에서도 같은 new_option 이벤트가 나와 id로 걸러짐)
+            if (reusedCol !== null && r[reusedCol] && !olderCols.some(col => r[col])) continue;
+            const stockStr = prevCol === null ? '' : (r[prevCol] || '');
             const match = stockStr.toString().match(/^(\d+)/);
-            if (match) {
-                const key = `${storeId}__${productId}__${optionName}`;
-                result[key] = parseInt(match[1], 10);
-            }
+            const key = `${storeId}__${productId}__${optionName}`;
+            result[key] = {
+                stock: match ? parseInt(match[1], 10) : null,
+                price: parseNumberCell(r[COL_PRICE]),
+                additionalPrice: parseNumberCell(r[COL_ADDITIONAL_PRICE])
+            };
         }
 
-        return result;
+        return { state: result, column };
     } catch (e) {
-        console.error(`전체 재고 읽기 중 오류: ${e.message}`);
-        return {};
+        console.error(`전체 재고 읽기 중 오류 (${target.sheetName}): ${e.message}`);
+        return null;
     }
 }
 
 /**
  * 여러 옵션을 시트에 한 번에 배치 기록
  * @param {Array} items - [{storeId, storeName, productId, productName, optionName, additionalPrice, price, stockValue, timestamp}]
+ * @param {object} target - 기록 대상 {spreadsheetId, sheetName} (기본: daily_stock_)
  */
-async function batchUpsertToSheet(items) {
+async function batchUpsertToTarget(items, target = DEFAULT_TARGET) {
     if (!items || items.length === 0) return;
 
     try {
         const sheetsClient = await initSheets();
-        await ensureHeaders();
+        await ensureHeaders(target);
 
-        const data = await readSheetData();
+        const data = await readSheetData(target);
         const headerRow = data[0] || [];
         const timestamp = items[0].timestamp;
 
@@ -1090,19 +1127,19 @@ async function batchUpsertToSheet(items) {
             while (nextCol < headerRow.length && headerRow[nextCol]) nextCol++;
             targetCol = nextCol;
             // 열 확장 여부 확인
-            await ensureSheetColumns(sheetsClient, targetCol + 1);
+            await ensureSheetColumns(sheetsClient, targetCol + 1, target);
         }
 
         const colLetter = numberToColumnLetter(targetCol);
         const valueUpdates = [];
         const formatRequests = [];
-        const sheetId = await getSheetId(sheetsClient);
+        const sheetId = await getSheetId(sheetsClient, target);
         const newRows = [];
 
         // 헤더에 타임스탬프 기록 (새 열인 경우)
         if (!reuseColumn) {
             valueUpdates.push({
-                range: `${SHEET_NAME}!${colLetter}1`,
+                range: `${target.sheetName}!${colLetter}1`,
                 values: [[timestamp]]
             });
         }
@@ -1132,10 +1169,11 @@ async function batchUpsertToSheet(items) {
                 }
             } else {
                 // 기존 행 업데이트
-                valueUpdates.push({ range: `${SHEET_NAME}!${colLetter}${rowIndex + 1}`, values: [[String(stockValue)]] });
-                if (storeName) valueUpdates.push({ range: `${SHEET_NAME}!${numberToColumnLetter(COL_STORE_NAME)}${rowIndex + 1}`, values: [[String(storeName)]] });
-                if (productName) valueUpdates.push({ range: `${SHEET_NAME}!${numberToColumnLetter(COL_PRODUCT_NAME)}${rowIndex + 1}`, values: [[String(productName)]] });
-                if (price !== null) valueUpdates.push({ range: `${SHEET_NAME}!${numberToColumnLetter(COL_PRICE)}${rowIndex + 1}`, values: [[String(price)]] });
+                valueUpdates.push({ range: `${target.sheetName}!${colLetter}${rowIndex + 1}`, values: [[String(stockValue)]] });
+                if (storeName) valueUpdates.push({ range: `${target.sheetName}!${numberToColumnLetter(COL_STORE_NAME)}${rowIndex + 1}`, values: [[String(storeName)]] });
+                if (productName) valueUpdates.push({ range: `${target.sheetName}!${numberToColumnLetter(COL_PRODUCT_NAME)}${rowIndex + 1}`, values: [[String(productName)]] });
+                if (price !== null) valueUpdates.push({ range: `${target.sheetName}!${numberToColumnLetter(COL_PRICE)}${rowIndex + 1}`, values: [[String(price)]] });
+                if (additionalPrice !== null && additionalPrice !== undefined) valueUpdates.push({ range: `${target.sheetName}!${numberToColumnLetter(COL_ADDITIONAL_PRICE)}${rowIndex + 1}`, values: [[String(additionalPrice)]] });
 
                 const color = getColorFromStockValue(stockValue);
                 if (color) {
@@ -1148,8 +1186,8 @@ async function batchUpsertToSheet(items) {
         if (newRows.length > 0) {
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.values.append({
-                    spreadsheetId: SPREADSHEET_ID,
-                    range: `${SHEET_NAME}!A:ZZ`,
+                    spreadsheetId: target.spreadsheetId,
+                    range: `${target.sheetName}!A:ZZ`,
                     valueInputOption: 'RAW',
                     insertDataOption: 'INSERT_ROWS',
                     resource: { values: newRows }
@@ -1161,7 +1199,7 @@ async function batchUpsertToSheet(items) {
         if (valueUpdates.length > 0) {
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.values.batchUpdate({
-                    spreadsheetId: SPREADSHEET_ID,
+                    spreadsheetId: target.spreadsheetId,
                     resource: { valueInputOption: 'RAW', data: valueUpdates }
                 });
             }, '값 배치 업데이트');
@@ -1171,13 +1209,13 @@ async function batchUpsertToSheet(items) {
         if (formatRequests.length > 0) {
             await retryWithBackoff(async () => {
                 return await sheetsClient.spreadsheets.batchUpdate({
-                    spreadsheetId: SPREADSHEET_ID,
+                    spreadsheetId: target.spreadsheetId,
                     resource: { requests: formatRequests }
                 });
             }, '색상 배치 적용');
         }
 
-        console.log(`[배치 완료] ${colLetter}열에 ${items.length}개 기록 (${reuseColumn ? '열 재사용' : '새 열'})`);
+        console.log(`[배치 완료] ${target.sheetName} ${colLetter}열에 ${items.length}개 기록 (${reuseColumn ? '열 재사용' : '새 열'})`);
     } catch (e) {
         console.error(`배치 시트 기록 중 오류: ${e.message}`);
         throw e;
@@ -1186,22 +1224,28 @@ async function batchUpsertToSheet(items) {
 
 const ORPHAN_LOG_SHEET = 'orphan_log';
 const ORPHAN_LOG_HEADERS = ['발견일시', 'storeId', 'storeName', 'productId', 'productName', 'optionName', '메모'];
+const orphanLogReady = new Set(); // orphan_log 확인이 끝난 spreadsheetId
 
 /**
- * orphan_log 시트가 없으면 생성하고 헤더 기록
+ * orphan_log 시트가 없으면 생성하고 헤더 기록 (프로세스당 스프레드시트별 1회 확인)
  */
-async function ensureOrphanLogSheet(sheetsClient) {
+async function ensureOrphanLogSheet(sheetsClient, target = DEFAULT_TARGET) {
+    if (orphanLogReady.has(target.spreadsheetId)) return;
+
     const response = await retryWithBackoff(async () => {
-        return await sheetsClient.spreadsheets.get({ spreadsheetId: SPREADSHEET_ID });
+        return await sheetsClient.spreadsheets.get({ spreadsheetId: target.spreadsheetId });
     }, 'orphan_log 시트 확인');
 
     const exists = response.data.sheets.some(s => s.properties.title === ORPHAN_LOG_SHEET);
-    if (exists) return;
+    if (exists) {
+        orphanLogReady.add(target.spreadsheetId);
+        return;
+    }
 
     // 시트 생성
     await retryWithBackoff(async () => {
         return await sheetsClient.spreadsheets.batchUpdate({
-            spreadsheetId: SPREADSHEET_ID,
+            spreadsheetId: target.spreadsheetId,
             resource: { requests: [{ addSheet: { properties: { title: ORPHAN_LOG_SHEET } } }] }
         });
     }, 'orphan_log 시트 생성');
@@ -1209,17 +1253,18 @@ async function ensureOrphanLogSheet(sheetsClient) {
     // 헤더 + 안내 메모 기록
     await retryWithBackoff(async () => {
         return await sheetsClient.spreadsheets.values.batchUpdate({
-            spreadsheetId: SPREADSHEET_ID,
+            spreadsheetId: target.spreadsheetId,
             resource: {
                 valueInputOption: 'RAW',
                 data: [
                     { range: `${ORPHAN_LOG_SHEET}!A1:G1`, values: [ORPHAN_LOG_HEADERS] },
-                    { range: `${ORPHAN_LOG_SHEET}!I1`, values: [['⚠️ daily_stock_ 시트 정리 필요: 아래 기록된 옵션 행은 더 이상 존재하지 않는 고아행입니다. daily_stock_ 시트에서 해당 행을 삭제해주세요.']] }
+                    { range: `${ORPHAN_LOG_SHEET}!I1`, values: [[`⚠️ ${target.sheetName} 시트 정리 필요: 아래 기록된 옵션 행은 더 이상 존재하지 않는 고아행입니다. ${target.sheetName} 시트에서 해당 행을 삭제해주세요.`]] }
                 ]
             }
         });
     }, 'orphan_log 헤더 기록');
 
+    orphanLogReady.add(target.spreadsheetId);
     console.log('[고아행] orphan_log 시트 생성 완료');
 }
 
@@ -1228,16 +1273,20 @@ async function ensureOrphanLogSheet(sheetsClient) {
  * @param {Set<string>} storeIds - 이번 실행에서 처리한 storeId 집합
  * @param {Set<string>} updatedKeys - 업데이트된 "storeId__productId__optionName" 집합
  * @param {string} timestamp - 현재 타임스탬프
+ * @param {Set<string>|null} productIds - 지정하면 해당 productId 행만 검사 (워치리스트 분배 실행용)
+ * @param {object} target - 기록 대상 {spreadsheetId, sheetName} (기본: daily_stock_)
+ * @returns {Promise<Array>} - 고아행 목록 [{storeId, storeName, productId, productName, optionName}]
  */
-async function markDeletedOptions(storeIds, updatedKeys, timestamp) {
-    if (!storeIds || storeIds.size === 0) return;
+async function markDeletedOptionsInTarget(storeIds, updatedKeys, timestamp, productIds = null, target = DEFAULT_TARGET) {
+    if (!storeIds || storeIds.size === 0) return [];
 
     try {
         const sheetsClient = await initSheets();
-        const data = await readSheetData();
-        if (data.length < 2) return;
+        const data = await readSheetData(target);
+        if (data.length < 2) return [];
 
         const orphanRows = [];
+        const orphans = [];
 
         for (let row = 1; row < data.length; row++) {
             const r = data[row];
@@ -1246,12 +1295,14 @@ async function markDeletedOptions(storeIds, updatedKeys, timestamp) {
             if (!storeIds.has(storeId)) continue;
 
             const productId = r[COL_PRODUCT_ID] || '';
+            if (productIds && !productIds.has(productId)) continue;
             const optionName = r[COL_OPTION_NAME] || '';
             const key = `${storeId}__${productId}__${optionName}`;
 
             if (!updatedKeys.has(key)) {
                 const storeName = r[COL_STORE_NAME] || '';
                 const productName = r[COL_PRODUCT_NAME] || '';
+                orphans.push({ storeId, storeName, productId, productName, optionName });
                 orphanRows.push([
                     timestamp,
                     storeId,
@@ -1259,32 +1310,328 @@ async function markDeletedOptions(storeIds, updatedKeys, timestamp) {
                     productId,
                     productName,
                     optionName,
-                    `daily_stock_ ${row + 1}행 정리 필요`
+                    `${target.sheetName} ${row + 1}행 정리 필요`
                 ]);
             }
         }
 
         if (orphanRows.length === 0) {
             console.log('[고아행] 해당 없음');
-            return;
+            return orphans;
+        }
+
+        // 로그 기록에 실패해도 찾은 고아행은 돌려줌 (사라진 옵션 이벤트용)
+        try {
+            await ensureOrphanLogSheet(sheetsClient, target);
+
+            await retryWithBackoff(async () => {
+                return await sheetsClient.spreadsheets.values.append({
+                    spreadsheetId: target.spreadsheetId,
+                    range: `${ORPHAN_LOG_SHEET}!A:G`,
+                    valueInputOption: 'RAW',
+                    insertDataOption: 'INSERT_ROWS',
+                    resource: { values: orphanRows }
+                });
+            }, 'orphan_log 기록');
+
+            console.log(`[고아행] ${orphanRows.length}개 행을 orphan_log에 기록 완료`);
+        } catch (e) {
+            console.error(`고아행 로그 기록 중 오류: ${e.message}`);
+        }
+        return orphans;
+    } catch (e) {
+        console.error(`고아행 검사 중 오류: ${e.message}`);
+        return [];
+    }
+}
+
+// ─── 스토어별 시트 분할 (샤딩) ─────────────────────────────────
+//
+// sheet_shards.json 이 있으면 스토어(또는 스토어 그룹)별로 다른 탭/스프레드시트에 기록한다.
+// 설정에 없는 스토어는 기존 daily_stock_ 시트에 기록된다.
+// shard_index 탭은 스토어 → 샤드 위치 목록일 뿐이고 재고 값은 담지 않는다.
+// 여러 스토어의 재고를 한 번에 조회하려면 실행 이력을 색인하는 조회 서버(naver_cli.py serve)를 사용한다.
+// 샤드 스토어의 이전 상태는 샤드에서만 읽는다. 기존 daily_stock_ 이력을 이어받아야 하는
+// 전환 기간에는 "migration": true 로 기본 시트도 함께 읽는다 (샤드 값이 우선).
+// {
+//   "maxParallel": 3,
+//   "migration": false,
+//   "shards": [
+//     { "name": "kalala", "sheetName": "daily_stock_kalala", "stores": ["100386433"] },
+//     { "name": "big", "spreadsheetId": "별도 스프레드시트 ID", "sheetName": "daily_stock_", "stores": ["101158029", "100418495"] }
+//   ]
+// }
+
+const SHARD_CONFIG_PATH = process.env.SHEET_SHARDS_PATH || path.join(__dirname, 'sheet_shards.json');
+const SHARD_INDEX_SHEET = 'shard_index';
+const DEFAULT_MAX_PARALLEL = 3;
+
+let shardConfigCache = undefined;
+let shardIndexWritten = false;
+const ensuredTargets = new Set();
+
+function targetKey(target) {
+    return `${target.spreadsheetId}/${target.sheetName}`;
+}
+
+/**
+ * 샤딩 설정 로드 (파일이 없거나 shards가 비어있으면 null = 샤딩 미사용)
+ */
+function loadShardConfig() {
+    if (shardConfigCache !== undefined) return shardConfigCache;
+
+    shardConfigCache = null;
+    try {
+        if (fs.existsSync(SHARD_CONFIG_PATH)) {
+            const config = JSON.parse(fs.readFileSync(SHARD_CONFIG_PATH, 'utf-8'));
+            const shards = (config.shards || []).map(shard => ({
+                name: shard.name || shard.sheetName,
+                spreadsheetId: shard.spreadsheetId || SPREADSHEET_ID,
+                sheetName: shard.sheetName || SHEET_NAME,
+                stores: (shard.stores || []).map(String)
+            }));
+            if (shards.length > 0) {
+                const storeMap = {};
+                for (const shard of shards) {
+                    for (const storeId of shard.stores) storeMap[storeId] = shard;
+                }
+                shardConfigCache = {
+                    shards,
+                    storeMap,
+                    maxParallel: config.maxParallel || DEFAULT_MAX_PARALLEL,
+                    migration: config.migration === true
+                };
+                console.log(`[샤딩] ${shards.length}개 샤드 설정 로드 (${SHARD_CONFIG_PATH})`);
+            }
+        }
+    } catch (e) {
+        console.error(`샤딩 설정 로드 중 오류 (기본 시트 사용): ${e.message}`);
+        shardConfigCache = null;
+    }
+    return shardConfigCache;
+}
+
+/**
+ * 스토어 ID → 기록 대상 {spreadsheetId, sheetName}
+ */
+function resolveShard(storeId) {
+    const config = loadShardConfig();
+    const shard = config?.storeMap[String(storeId)];
+    return shard ? { spreadsheetId: shard.spreadsheetId, sheetName: shard.sheetName } : DEFAULT_TARGET;
+}
+
+/**
+ * 동시 실행 수를 제한해 작업 실행 (할당량 초과는 retryWithBackoff가 처리)
+ */
+async function runWithConcurrency(tasks, limit) {
+    const results = new Array(tasks.length);
+    let next = 0;
+    const workers = Array.from({ length: Math.min(limit, tasks.length) }, async () => {
+        while (next < tasks.length) {
+            const i = next++;
+            results[i] = await tasks[i]();
         }
+    });
+    await Promise.all(workers);
+    return results;
+}
+
+/**
+ * 샤드 탭이 없으면 생성 (프로세스당 대상별 1회 확인)
+ */
+async function ensureTargetSheet(sheetsClient, target) {
+    const key = targetKey(target);
+    if (ensuredTargets.has(key)) return;
 
-        await ensureOrphanLogSheet(sheetsClient);
+    const response = await retryWithBackoff(async () => {
+        return await sheetsClient.spreadsheets.get({ spreadsheetId: target.spreadsheetId });
+    }, `${target.sheetName} 시트 확인`);
 
+    const exists = response.data.sheets.some(s => s.properties.title === target.sheetName);
+    if (!exists) {
         await retryWithBackoff(async () => {
-            return await sheetsClient.spreadsheets.values.append({
-                spreadsheetId: SPREADSHEET_ID,
-                range: `${ORPHAN_LOG_SHEET}!A:G`,
-                valueInputOption: 'RAW',
-                insertDataOption: 'INSERT_ROWS',
-                resource: { values: orphanRows }
+            return await sheetsClient.spreadsheets.batchUpdate({
+                spreadsheetId: target.spreadsheetId,
+                resource: { requests: [{ addSheet: { properties: { title: target.sheetName } } }] }
             });
-        }, 'orphan_log 기록');
+        }, `${target.sheetName} 시트 생성`);
+        console.log(`[샤딩] ${target.sheetName} 시트 생성 완료`);
+    }
+    ensuredTargets.add(key);
+}
+
+/**
+ * 기본 스프레드시트의 shard_index 탭에 스토어 → 샤드 위치 기록 (어느 시트를 열어야 하는지 찾는 목록)
+ * 설정에서 빠진 샤드/스토어가 남지 않도록 기존 내용을 지우고 다시 쓴다.
+ * @param {Object<string, string>} storeNames - { storeId: storeName } 이번 배치에서 확인된 이름
+ */
+async function writeShardIndex(sheetsClient, storeNames = {}) {
+    const config = loadShardConfig();
+    if (!config || shardIndexWritten) return;
+
+    const rows = [['store_id', 'store_name', 'shard', 'spreadsheet_id', 'sheet_name', 'link']];
+    for (const shard of config.shards) {
+        const link = `=HYPERLINK("https://docs.google.com/spreadsheets/d/${shard.spreadsheetId}/edit", "${shard.name}")`;
+        for (const storeId of shard.stores) {
+            rows.push([storeId, storeNames[storeId] || '', shard.name, shard.spreadsheetId, shard.sheetName, link]);
+        }
+    }
+    rows.push(['*', '(기타 스토어)', 'default', SPREADSHEET_ID, SHEET_NAME, '']);
 
-        console.log(`[고아행] ${orphanRows.length}개 행을 orphan_log에 기록 완료`);
+    try {
+        await ensureTargetSheet(sheetsClient, { spreadsheetId: SPREADSHEET_ID, sheetName: SHARD_INDEX_SHEET });
+        await retryWithBackoff(async () => {
+            return await sheetsClient.spreadsheets.values.clear({
+                spreadsheetId: SPREADSHEET_ID,
+                range: `${SHARD_INDEX_SHEET}!A:F`
+            });
+        }, 'shard_index 초기화');
+        await retryWithBackoff(async () => {
+            return await sheetsClient.spreadsheets.values.update({
+                spreadsheetId: SPREADSHEET_ID,
+                range: `${SHARD_INDEX_SHEET}!A1:F${rows.length}`,
+                valueInputOption: 'USER_ENTERED',
+                resource: { values: rows }
+            });
+        }, 'shard_index 기록');
+        shardIndexWritten = true;
     } catch (e) {
-        console.error(`고아행 로그 기록 중 오류: ${e.message}`);
+        console.error(`shard_index 기록 중 오류: ${e.message}`);
+    }
+}
+
+/**
+ * 항목들을 기록 대상별로 묶기
+ * @returns {Map<string, {target: object, items: Array}>}
+ */
+function groupByShard(items, getStoreId) {
+    const groups = new Map();
+    for (const item of items) {
+        const target = resolveShard(getStoreId(item));
+        const key = targetKey(target);
+        if (!groups.has(key)) groups.set(key, { target, items: [] });
+        groups.get(key).items.push(item);
+    }
+    return groups;
+}
+
+/**
+ * 전체 시트에서 행별 이전 상태를 한 번에 읽어 map으로 반환 (샤딩 설정 시 관련 샤드를 병렬로 읽어 병합)
+ * key: "storeId__productId__optionName", value: { stock, price, additionalPrice }
+ * @param {string} currentTimestamp - 현재 타임스탬프 (15분 이내 열 판별용)
+ * @param {Iterable<string>|null} storeIds - 지정하면 해당 스토어가 속한 샤드만 읽음
+ * @returns {Promise<{state: Object, columnOf: Function}|null>} - columnOf(storeId)는 그 스토어가 기록될 열의 헤더 타임스탬프
+ *          하나라도 읽기 실패하면 null (일부만 병합하면 나머지가 신규 옵션으로 보임)
+ */
+async function readAllStateFromSheet(currentTimestamp = null, storeIds = null) {
+    const config = loadShardConfig();
+    if (!config) {
+        const result = await readAllStateFromTarget(currentTimestamp);
+        return result && { state: result.state, columnOf: () => result.column };
+    }
+
+    // 기본 시트는 샤드가 없는 스토어가 있을 때만 읽음 (전환 기간에는 이력 보존을 위해 먼저 읽고, 샤드 값이 우선)
+    const targets = new Map();
+    if (config.migration || !storeIds) targets.set(targetKey(DEFAULT_TARGET), DEFAULT_TARGET);
+    const shardTargets = storeIds
+        ? [...storeIds].map(resolveShard)
+        : config.shards.map(s => ({ spreadsheetId: s.spreadsheetId, sheetName: s.sheetName }));
+    for (const target of shardTargets) targets.set(targetKey(target), target);
+
+    const sheetsClient = await initSheets();
+    const maps = await runWithConcurrency([...targets.values()].map(target => async () => {
+        try {
+            // 아직 만들어지지 않은 샤드 탭은 읽기 실패가 아니라 빈 시트
+            if (target !== DEFAULT_TARGET) await ensureTargetSheet(sheetsClient, target);
+        } catch (e) {
+            console.error(`샤드 시트 확인 중 오류 (${target.sheetName}): ${e.message}`);
+            return null;
+        }
+        return readAllStateFromTarget(currentTimestamp, target);
+    }), config.maxParallel);
+    if (maps.some(map => map === null)) return null;
+
+    const columns = new Map([...targets.keys()].map((key, i) => [key, maps[i].column]));
+    return {
+        state: Object.assign({}, ...maps.map(map => map.state)),
+        columnOf: storeId => columns.get(targetKey(resolveShard(storeId))) ?? currentTimestamp
+    };
+}
+
+/**
+ * 전체 시트에서 최근 재고 값을 한 번에 읽어 map으로 반환
+ * key: "storeId__productId__optionName", value: 숫자 재고
+ * @param {string} currentTimestamp - 현재 타임스탬프 (15분 이내 열 판별용)
+ * @param {Iterable<string>|null} storeIds - 지정하면 해당 스토어가 속한 샤드만 읽음
+ */
+async function readAllStockFromSheet(currentTimestamp = null, storeIds = null) {
+    const previous = await readAllStateFromSheet(currentTimestamp, storeIds);
+    const result = {};
+    for (const [key, value] of Object.entries(previous?.state || {})) {
+        if (value.stock !== null) result[key] = value.stock;
+    }
+    return result;
+}
+
+/**
+ * 여러 옵션을 시트에 한 번에 배치 기록 (샤딩 설정 시 샤드별로 병렬 기록)
+ * @param {Array} items - [{storeId, storeName, productId, productName, optionName, additionalPrice, price, stockValue, timestamp}]
+ */
+async function batchUpsertToSheet(items) {
+    if (!items || items.length === 0) return;
+
+    const config = loadShardConfig();
+    if (!config) return batchUpsertToTarget(items);
+
+    const sheetsClient = await initSheets();
+    const groups = [...groupByShard(items, item => item.storeId).values()];
+    const start = Date.now();
+
+    await runWithConcurrency(groups.map(({ target, items: shardItems }) => async () => {
+        if (target !== DEFAULT_TARGET) await ensureTargetSheet(sheetsClient, target);
+        await batchUpsertToTarget(shardItems, target);
+    }), config.maxParallel);
+
+    const storeNames = {};
+    for (const item of items) {
+        if (item.storeName) storeNames[String(item.storeId)] = item.storeName;
+    }
+    await writeShardIndex(sheetsClient, storeNames);
+
+    console.log(`[샤딩] ${groups.length}개 샤드 병렬 기록 완료 (${((Date.now() - start) / 1000).toFixed(1)}초)`);
+}
+
+/**
+ * 이번 실행에서 업데이트 안 된 행을 orphan_log 시트에 로그 기록 (샤딩 설정 시 샤드별 처리)
+ * @param {Set<string>} storeIds - 이번 실행에서 처리한 storeId 집합
+ * @param {Set<string>} updatedKeys - 업데이트된 "storeId__productId__optionName" 집합
+ * @param {string} timestamp - 현재 타임스탬프
+ * @param {Set<string>|null} productIds - 지정하면 해당 productId 행만 검사 (워치리스트 분배 실행용)
+ * @returns {Promise<Array>} - 고아행 목록 [{storeId, storeName, productId, productName, optionName}]
+ */
+async function markDeletedOptions(storeIds, updatedKeys, timestamp, productIds = null) {
+    if (!storeIds || storeIds.size === 0) return [];
+
+    const config = loadShardConfig();
+    if (!config) return markDeletedOptionsInTarget(storeIds, updatedKeys, timestamp, productIds);
+
+    const groups = [...groupByShard([...storeIds], storeId => storeId).values()];
+
+    // 같은 스프레드시트의 샤드들이 병렬로 orphan_log를 동시에 만들지 않도록 먼저 한 번씩 준비
+    const sheetsClient = await initSheets();
+    const spreadsheets = new Map(groups.map(({ target }) => [target.spreadsheetId, target]));
+    for (const target of spreadsheets.values()) {
+        try {
+            await ensureOrphanLogSheet(sheetsClient, target);
+        } catch (e) {
+            console.error(`orphan_log 시트 준비 중 오류 (${target.spreadsheetId}): ${e.message}`);
+        }
     }
+
+    const results = await runWithConcurrency(groups.map(({ target, items: shardStoreIds }) => () =>
+        markDeletedOptionsInTarget(new Set(shardStoreIds), updatedKeys, timestamp, productIds, target)
+    ), config.maxParallel);
+    return results.flat();
 }
 
 module.exports = {
@@ -1294,7 +1641,9 @@ module.exports = {
     upsertProductToSheet,
     readStockFromSheet,
     readAllStockFromSheet,
+    readAllStateFromSheet,
     batchUpsertToSheet,
     markDeletedOptions,
+    resolveShard,
     initSheets
 };
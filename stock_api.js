@@ -1,13 +1,15 @@
 /**
  * 네이버 장바구니 실재고 조회 - 순수 HTTP (브라우저 없음)
- * 사용법: node stock_api.js [프로필명]
+ * 사용법: node stock_api.js [프로필명] [공유타임스탬프] [--watchlist]
  * 예시:  node stock_api.js naver_bnam91
+ *        node stock_api.js naver_bnam91 --watchlist  (워치리스트 분배분만 조회)
  */
 
 const fs = require('fs');
 const path = require('path');
 const { execSync, spawn } = require('child_process');
 const { batchUpdateStocks, setSessionTimestamp, clearSessionTimestamp } = require('./dbModule');
+const { USER_DATA_ROOT, saveCartSnapshot, recordOptionCounts, getAssignedProducts, printPlan } = require('./watchlistModule');
 
 const GRAPHQL_URL = 'https://shopping.naver.com/cart/graphql';
 const CDP_PORT = 9222;
@@ -33,11 +35,6 @@ const CHROME_KILL_CMD = IS_WIN
     ? 'taskkill /F /IM chrome.exe'
     : 'pkill -a "Google Chrome"';
 
-// OS별 기본 user_data 루트
-const USER_DATA_ROOT = IS_WIN
-    ? path.join(process.env.USERPROFILE || 'C:\\Users\\user', 'Documents', 'github_cloud', 'user_data')
-    : path.join('/Users/a1/Documents/github_cloud/user_data');
-
 // 프로필명 → CDP용 Chrome 프로필 경로 매핑
 const CDP_PROFILE_MAP = {
     naver_bnam91: path.join(USER_DATA_ROOT, 'naver_bnam91_cdp'),
@@ -290,7 +287,7 @@ query getCartProductModifyView($cartProductId: String!, $deviceType: DeviceType!
 
 // ─── 메인 ──────────────────────────────────────────────────────
 
-async function getStockForAllProducts(profile = 'naver_bnam91', sharedTimestamp = null) {
+async function getStockForAllProducts(profile = 'naver_bnam91', sharedTimestamp = null, useWatchlist = false) {
     console.log(`\n[${profile}] 재고 조회 시작`);
 
     const cookieStr = loadCookies(profile);
@@ -309,6 +306,16 @@ async function getStockForAllProducts(profile = 'naver_bnam91', sharedTimestamp
     }
     console.log(`총 ${cart.productsCount}개 상품 발견\n`);
 
+    // 워치리스트 모드: 장바구니 스냅샷 저장 후 이 계정에 배정된 상품만 조회
+    let assignedCartProductIds = null;
+    if (useWatchlist) {
+        saveCartSnapshot(profile, cart);
+        const { products, plan } = getAssignedProducts(profile, USER_DATA_ROOT);
+        printPlan(plan);
+        assignedCartProductIds = new Set(products.map(p => p.cartProductId));
+        console.log(`[${profile}] 배정된 상품 ${assignedCartProductIds.size}개 조회\n`);
+    }
+
     const timestamp = setSessionTimestamp(sharedTimestamp);
     const collected = []; // 시트 쓰기 없이 결과만 수집
 
@@ -316,6 +323,7 @@ async function getStockForAllProducts(profile = 'naver_bnam91', sharedTimestamp
     for (const store of cart.stores) {
         for (const product of store.products) {
             const { cartProductId, name, channel } = product;
+            if (assignedCartProductIds && !assignedCartProductIds.has(cartProductId)) continue;
             const storeName = channel?.channelName || '';
             const storeId = String(channel?.naverPaySellerNo || channel?.channelNo || '');
 
@@ -359,7 +367,9 @@ async function getStockForAllProducts(profile = 'naver_bnam91', sharedTimestamp
 
     // 3. 시트에 한 번에 배치 기록
     console.log(`\n시트에 ${collected.length}개 옵션 배치 기록 중...`);
-    await batchUpdateStocks(collected, timestamp);
+    // 워치리스트 모드에서는 다른 계정이 조회한 상품을 고아행으로 보지 않도록 상품 단위로 제한
+    await batchUpdateStocks(collected, timestamp, { productScoped: !!assignedCartProductIds });
+    if (useWatchlist) recordOptionCounts(profile, collected);
 
     clearSessionTimestamp();
 
@@ -370,15 +380,17 @@ async function getStockForAllProducts(profile = 'naver_bnam91', sharedTimestamp
 
 // CLI 실행 (세션 만료 시 1회 자동 갱신 후 재시도)
 async function run() {
-    const profile = process.argv[2] || 'naver_bnam91';
-    const sharedTimestamp = process.argv[3] || null;
+    const args = process.argv.slice(2).filter(a => !a.startsWith('--'));
+    const useWatchlist = process.argv.includes('--watchlist');
+    const profile = args[0] || 'naver_bnam91';
+    const sharedTimestamp = args[1] || null;
     try {
-        await getStockForAllProducts(profile, sharedTimestamp);
+        await getStockForAllProducts(profile, sharedTimestamp, useWatchlist);
     } catch (e) {
         const isAuthError = e.message.includes('Internal server error') || e.message.includes('Unauthorized') || e.message.includes('쿠키 파일 없음');
         if (isAuthError && CDP_PROFILE_MAP[profile]) {
             await refreshSession(profile);
-            await getStockForAllProducts(profile, sharedTimestamp);
+            await getStockForAllProducts(profile, sharedTimestamp, useWatchlist);
         } else {
             throw e;
         }
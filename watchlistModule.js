@@ -0,0 +1,484 @@
+/**
+ * 워치리스트 관리 - 추적 상품 마스터 목록 + 계정별 분배
+ *
+ * - watchlist.json: 추적할 상품 마스터 목록 (비어있으면 장바구니에 있는 상품 전체 추적)
+ * - watchlist_carts/<프로필>.json: 계정별 장바구니 스냅샷 (각 프로세스가 자기 것만 기록)
+ * - watchlist_plan.json: 확정된 분배 결과 (모든 계정이 같은 분배를 공유)
+ *
+ * 실행마다 스냅샷과 옵션 수가 바뀌므로 분배를 매번 다시 계산하면 계정마다 다른 분배를 보고
+ * 상품이 누락될 수 있다. 그래서 분배는 파일로 고정하고, 계정 목록이나 워치리스트가 바뀌었을 때와
+ * rebalance 명령을 실행했을 때만 다시 계산한다. 분배 당시 스냅샷이 없어 빠졌던 계정의 스냅샷이
+ * 생기면 그때도 다시 계산한다.
+ * - 분배 이후 장바구니에 새로 담긴 상품: 처음 본 계정이 담당으로 등록 (다른 계정은 조회하지 않음)
+ * - 배정된 상품이 담당 계정 장바구니에서 빠짐: 그 상품만 다른 계정으로 옮김 (나머지 배정은 유지)
+ * 상품 조회는 cartProductId가 필요하므로 해당 상품이 장바구니에 있는 계정에만 배정된다.
+ *
+ * 사용법: node watchlistModule.js status|rebalance|add <productId> [메모]|remove <productId>
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+// 계정(프로필) 폴더 루트 - stock_api.js와 rebalance가 같은 계정 목록을 보도록 여기서만 정의
+const USER_DATA_ROOT = process.env.USER_DATA_ROOT || (process.platform === 'win32'
+    ? path.join(process.env.USERPROFILE || 'C:\\Users\\user', 'Documents', 'github_cloud', 'user_data')
+    : path.join('/Users/a1/Documents/github_cloud/user_data'));
+
+const WATCHLIST_PATH = path.join(__dirname, 'watchlist.json');
+const CART_SNAPSHOT_DIR = path.join(__dirname, 'watchlist_carts');
+const PLAN_PATH = path.join(__dirname, 'watchlist_plan.json');
+const PLAN_LOCK_PATH = `${PLAN_PATH}.lock`;
+const PLAN_LOCK_TIMEOUT = 10000; // 분배 잠금 대기 시간 (밀리초)
+const PLAN_LOCK_STALE = 60000;   // 이보다 오래된 잠금 파일은 죽은 프로세스의 것으로 간주
+
+// 폴링 비용: 상품당 GraphQL 1회 + 옵션 수에 비례한 시트 기록 비용
+const REQUEST_COST = 1;
+const OPTION_COST = 0.02;
+
+/**
+ * 워치리스트 로드 (파일 없으면 빈 목록)
+ * @returns {{products: Object<string, {productName?: string, storeName?: string, memo?: string}>}}
+ */
+function loadWatchlist() {
+    if (!fs.existsSync(WATCHLIST_PATH)) return { products: {} };
+    const data = JSON.parse(fs.readFileSync(WATCHLIST_PATH, 'utf-8'));
+    return { products: data.products || {} };
+}
+
+function saveWatchlist(watchlist) {
+    fs.writeFileSync(WATCHLIST_PATH, JSON.stringify(watchlist, null, 2));
+}
+
+/**
+ * 임시 파일에 쓴 뒤 rename (다른 프로세스가 쓰다 만 파일을 읽지 않도록)
+ */
+function writeJsonAtomic(filePath, data) {
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    fs.writeFileSync(tmpPath, JSON.stringify(data, null, 2));
+    fs.renameSync(tmpPath, filePath);
+}
+
+/**
+ * user_data 폴더에서 계정(프로필) 목록 조회
+ * naver_ 로 시작하는 폴더만, CDP 전용 프로필(_cdp)은 제외
+ * @param {string} userDataRoot - user_data 경로
+ * @returns {string[]|null} - 폴더가 없으면 null
+ */
+function listAccounts(userDataRoot) {
+    if (!userDataRoot || !fs.existsSync(userDataRoot)) return null;
+    return fs.readdirSync(userDataRoot, { withFileTypes: true })
+        .filter(d => d.isDirectory() && d.name.startsWith('naver_') && !d.name.endsWith('_cdp'))
+        .map(d => d.name)
+        .sort();
+}
+
+/**
+ * 장바구니 조회 결과(getGeneralCartCacheView)를 계정 스냅샷으로 저장
+ * 이전 스냅샷의 옵션 수(비용 추정용)는 유지한다.
+ * @param {string} profile - 프로필명
+ * @param {object} cart - getGeneralCartCacheView 응답
+ * @returns {object} - 저장된 스냅샷
+ */
+function saveCartSnapshot(profile, cart) {
+    const previous = loadCartSnapshots()[profile]?.products || {};
+    const products = {};
+
+    for (const store of cart?.stores || []) {
+        for (const product of store.products || []) {
+            const productId = String(product.productId || '');
+            if (!productId) continue;
+            products[productId] = {
+                cartProductId: product.cartProductId,
+                productName: product.name || '',
+                storeName: product.channel?.channelName || '',
+                optionCount: previous[productId]?.optionCount ?? null
+            };
+        }
+    }
+
+    const snapshot = { profile, updatedAt: new Date().toISOString(), products };
+    if (!fs.existsSync(CART_SNAPSHOT_DIR)) fs.mkdirSync(CART_SNAPSHOT_DIR, { recursive: true });
+    writeJsonAtomic(path.join(CART_SNAPSHOT_DIR, `${profile}.json`), snapshot);
+    return snapshot;
+}
+
+/**
+ * 조회 후 상품별 옵션 수를 스냅샷에 기록 (다음 분배의 비용 추정에 사용)
+ * @param {string} profile - 프로필명
+ * @param {Array} collected - [{productId, ...}] 옵션 단위 조회 결과
+ */
+function recordOptionCounts(profile, collected) {
+    const snapshot = loadCartSnapshots()[profile];
+    if (!snapshot) return;
+
+    const counts = {};
+    for (const item of collected) {
+        counts[item.productId] = (counts[item.productId] || 0) + 1;
+    }
+    for (const [productId, count] of Object.entries(counts)) {
+        if (snapshot.products[productId]) snapshot.products[productId].optionCount = count;
+    }
+    writeJsonAtomic(path.join(CART_SNAPSHOT_DIR, `${profile}.json`), snapshot);
+}
+
+/**
+ * 모든 계정 스냅샷 로드
+ * @returns {Object<string, object>} - { 프로필명: 스냅샷 }
+ */
+function loadCartSnapshots() {
+    if (!fs.existsSync(CART_SNAPSHOT_DIR)) return {};
+    const snapshots = {};
+    for (const file of fs.readdirSync(CART_SNAPSHOT_DIR)) {
+        if (!file.endsWith('.json')) continue;
+        try {
+            const snapshot = JSON.parse(fs.readFileSync(path.join(CART_SNAPSHOT_DIR, file), 'utf-8'));
+            snapshots[snapshot.profile || path.basename(file, '.json')] = snapshot;
+        } catch (e) {
+            console.warn(`[워치리스트] 스냅샷 읽기 실패 (${file}): ${e.message}`);
+        }
+    }
+    return snapshots;
+}
+
+/**
+ * 상품 폴링 비용 추정
+ */
+function estimateCost(optionCount) {
+    return REQUEST_COST + OPTION_COST * (optionCount || 1);
+}
+
+/**
+ * 워치리스트 상품을 계정별로 분배 (중복 제거 + 비용 균형)
+ *
+ * 비용이 큰 상품부터, 해당 상품을 장바구니에 가진 계정 중
+ * 누적 비용이 가장 작은 계정에 배정한다 (동점이면 프로필명 순).
+ *
+ * @param {object} watchlist - loadWatchlist() 결과
+ * @param {Object<string, object>} snapshots - loadCartSnapshots() 결과
+ * @param {string[]|null} accounts - 활성 계정 목록 (null이면 스냅샷이 있는 계정 전체)
+ * @returns {{assignments: Object<string, Array>, loads: Object<string, number>, missing: string[], duplicates: number}}
+ */
+function assignProducts(watchlist, snapshots, accounts = null) {
+    const activeAccounts = (accounts || Object.keys(snapshots)).filter(a => snapshots[a]).sort();
+
+    // 상품별 후보 계정 (장바구니에 해당 상품이 있는 계정)
+    const candidates = {};
+    for (const account of activeAccounts) {
+        for (const [productId, info] of Object.entries(snapshots[account].products || {})) {
+            if (!candidates[productId]) candidates[productId] = [];
+            candidates[productId].push({ account, ...info });
+        }
+    }
+
+    // 마스터 목록이 비어있으면 장바구니에 있는 상품 전체 추적
+    const tracked = Object.keys(watchlist.products || {});
+    const productIds = tracked.length > 0 ? tracked : Object.keys(candidates);
+
+    const missing = [];
+    const jobs = [];
+    let duplicates = 0;
+    for (const productId of productIds) {
+        const entries = candidates[productId];
+        if (!entries || entries.length === 0) {
+            missing.push(productId);
+            continue;
+        }
+        if (entries.length > 1) duplicates++;
+        const optionCount = Math.max(...entries.map(e => e.optionCount || 0)) || null;
+        jobs.push({ productId, cost: estimateCost(optionCount), entries });
+    }
+
+    // 후보가 적은 상품 → 비용이 큰 상품 순으로 배정해야 균형이 잘 맞음
+    jobs.sort((a, b) => a.entries.length - b.entries.length || b.cost - a.cost || a.productId.localeCompare(b.productId));
+
+    const loads = Object.fromEntries(activeAccounts.map(a => [a, 0]));
+    const assignments = Object.fromEntries(activeAccounts.map(a => [a, []]));
+    for (const job of jobs) {
+        let best = job.entries[0];
+        for (const entry of job.entries) {
+            if (loads[entry.account] < loads[best.account] ||
+                (loads[entry.account] === loads[best.account] && entry.account < best.account)) {
+                best = entry;
+            }
+        }
+        loads[best.account] += job.cost;
+        assignments[best.account].push({
+            productId: job.productId,
+            cartProductId: best.cartProductId,
+            productName: best.productName,
+            storeName: best.storeName,
+            cost: job.cost
+        });
+    }
+
+    return { assignments, loads, missing, duplicates };
+}
+
+/**
+ * 분배 재계산 기준 (계정 목록 + 워치리스트)
+ */
+function planInputs(watchlist, accounts) {
+    return {
+        accounts: [...(accounts || [])].sort(),
+        watchlist: Object.keys(watchlist.products || {}).sort()
+    };
+}
+
+function sameInputs(a, b) {
+    return JSON.stringify(a) === JSON.stringify(b);
+}
+
+/**
+ * 저장된 분배 로드 (없거나 깨졌으면 null)
+ */
+function loadPlan() {
+    if (!fs.existsSync(PLAN_PATH)) return null;
+    try {
+        return JSON.parse(fs.readFileSync(PLAN_PATH, 'utf-8'));
+    } catch (e) {
+        console.warn(`[워치리스트] 분배 파일 읽기 실패: ${e.message}`);
+        return null;
+    }
+}
+
+/**
+ * 분배 계산 후 저장
+ * owners는 상품 → 담당 계정 매핑 (조회 시 cartProductId는 실행 시점 장바구니 것을 사용)
+ */
+function buildPlan(watchlist, snapshots, accounts) {
+    const plan = assignProducts(watchlist, snapshots, accounts);
+    const owners = {};
+    for (const [account, products] of Object.entries(plan.assignments)) {
+        for (const product of products) owners[product.productId] = account;
+    }
+    const saved = {
+        createdAt: new Date().toISOString(),
+        inputs: planInputs(watchlist, accounts || Object.keys(snapshots)),
+        owners,
+        ...plan
+    };
+    writeJsonAtomic(PLAN_PATH, saved);
+    return saved;
+}
+
+function sleepSync(ms) {
+    Atomics.wait(new Int32Array(new SharedArrayBuffer(4)), 0, 0, ms);
+}
+
+/**
+ * 분배 파일 잠금 (여러 계정 프로세스가 동시에 재계산하지 않도록)
+ */
+function withPlanLock(fn) {
+    const deadline = Date.now() + PLAN_LOCK_TIMEOUT;
+    let fd = null;
+    while (fd === null) {
+        try {
+            fd = fs.openSync(PLAN_LOCK_PATH, 'wx');
+        } catch (e) {
+            if (e.code !== 'EEXIST') throw e;
+            try {
+                if (Date.now() - fs.statSync(PLAN_LOCK_PATH).mtimeMs > PLAN_LOCK_STALE) {
+                    fs.unlinkSync(PLAN_LOCK_PATH);
+                    continue;
+                }
+            } catch (statError) {
+                continue; // 그 사이 잠금이 풀림
+            }
+            if (Date.now() > deadline) throw new Error(`분배 잠금 대기 시간 초과: ${PLAN_LOCK_PATH}`);
+            sleepSync(100);
+        }
+    }
+    try {
+        return fn();
+    } finally {
+        fs.closeSync(fd);
+        try { fs.unlinkSync(PLAN_LOCK_PATH); } catch (e) { /* 이미 삭제됨 */ }
+    }
+}
+
+/**
+ * 저장된 분배를 가져오고, 재계산 조건이면 다시 계산
+ * @param {string[]|null} accounts - 활성 계정 목록
+ * @param {boolean} force - 무조건 재계산
+ */
+function getPlan(accounts, force = false) {
+    return withPlanLock(() => {
+        const watchlist = loadWatchlist();
+        const snapshots = loadCartSnapshots();
+        const inputs = planInputs(watchlist, accounts || Object.keys(snapshots));
+        const plan = loadPlan();
+
+        // 분배 당시 스냅샷이 없어 배정에서 빠졌던 계정이 이제 스냅샷을 가짐
+        const joined = plan ? plan.inputs.accounts.filter(a => !plan.assignments[a] && snapshots[a]) : [];
+
+        if (!force && plan && sameInputs(plan.inputs, inputs) && joined.length === 0) return plan;
+
+        const reason = force ? '수동 재계산'
+            : !plan ? '분배 없음'
+            : joined.length > 0 ? `스냅샷이 생긴 계정: ${joined.join(', ')}`
+            : '계정/워치리스트 변경';
+        console.log(`[워치리스트] 분배 재계산 (${reason})`);
+        return buildPlan(watchlist, snapshots, accounts);
+    });
+}
+
+/**
+ * 담당 계정 장바구니에서 빠진 상품만 다른 계정으로 재배정 (다른 상품의 배정은 건드리지 않음)
+ * @param {string} profile - 상품이 빠진 계정
+ * @param {string[]} productIds - 빠진 상품 ID 목록
+ */
+function reassignLostProducts(profile, productIds) {
+    withPlanLock(() => {
+        const plan = loadPlan();
+        if (!plan) return;
+        const snapshots = loadCartSnapshots();
+
+        for (const productId of productIds) {
+            if (plan.owners[productId] !== profile) continue; // 다른 프로세스가 이미 처리
+            const index = plan.assignments[profile].findIndex(p => p.productId === productId);
+            const [job] = plan.assignments[profile].splice(index, 1);
+            plan.loads[profile] -= job.cost;
+            delete plan.owners[productId];
+
+            const candidates = plan.inputs.accounts
+                .filter(a => a !== profile && snapshots[a]?.products?.[productId] && plan.assignments[a])
+                .sort((a, b) => plan.loads[a] - plan.loads[b] || a.localeCompare(b));
+            if (candidates.length === 0) {
+                plan.missing.push(productId);
+                console.log(`[워치리스트] ${productId}: 담은 계정이 없어 조회 중단 (담기 필요)`);
+                continue;
+            }
+            const account = candidates[0];
+            plan.assignments[account].push({ ...job, cartProductId: snapshots[account].products[productId].cartProductId });
+            plan.loads[account] += job.cost;
+            plan.owners[productId] = account;
+            console.log(`[워치리스트] ${productId}: ${profile} 장바구니에서 빠져 ${account}에 재배정`);
+        }
+        writeJsonAtomic(PLAN_PATH, plan);
+    });
+}
+
+/**
+ * 분배 이후 새로 담긴(담당자 없는) 상품을 처음 본 계정의 담당으로 등록
+ * 이미 다른 프로세스가 등록했으면 그 계정이 담당 (같은 상품을 두 계정이 조회하지 않도록)
+ * @param {string} profile - 상품을 본 계정
+ * @param {Array} products - [{productId, cartProductId, productName, storeName, optionCount}]
+ * @returns {object} - 갱신된 분배
+ */
+function claimNewProducts(profile, products) {
+    return withPlanLock(() => {
+        const plan = loadPlan();
+        let claimed = 0;
+        for (const product of products) {
+            if (plan.owners[product.productId]) continue;
+            if (!plan.assignments[profile]) {
+                plan.assignments[profile] = [];
+                plan.loads[profile] = 0;
+            }
+            const cost = estimateCost(product.optionCount);
+            plan.assignments[profile].push({
+                productId: product.productId,
+                cartProductId: product.cartProductId,
+                productName: product.productName,
+                storeName: product.storeName,
+                cost
+            });
+            plan.loads[profile] += cost;
+            plan.owners[product.productId] = profile;
+            plan.missing = plan.missing.filter(id => id !== product.productId);
+            claimed++;
+        }
+        if (claimed > 0) {
+            writeJsonAtomic(PLAN_PATH, plan);
+            console.log(`[워치리스트] 분배 이후 새로 담긴 상품 ${claimed}개를 ${profile} 담당으로 등록`);
+        }
+        return plan;
+    });
+}
+
+/**
+ * 특정 계정이 이번 실행에서 조회할 상품 목록
+ *
+ * 저장된 분배에서 이 계정이 담당한 상품 (새로 담긴 추적 상품은 먼저 담당 등록).
+ * cartProductId는 방금 저장한 이 계정의 스냅샷에서 가져온다.
+ *
+ * @param {string} profile - 프로필명
+ * @param {string} userDataRoot - user_data 경로 (계정 추가/삭제 감지용)
+ * @returns {{products: Array, plan: object}}
+ */
+function getAssignedProducts(profile, userDataRoot = USER_DATA_ROOT) {
+    let accounts = listAccounts(userDataRoot);
+    if (accounts && !accounts.includes(profile)) accounts = [...accounts, profile];
+
+    let plan = getPlan(accounts);
+    const watchlist = loadWatchlist();
+    const tracked = Object.keys(watchlist.products || {});
+    const cartProducts = loadCartSnapshots()[profile]?.products || {};
+
+    const unowned = Object.entries(cartProducts)
+        .filter(([productId]) => !plan.owners[productId] && (tracked.length === 0 || tracked.includes(productId)))
+        .map(([productId, info]) => ({ productId, ...info }));
+    if (unowned.length > 0) plan = claimNewProducts(profile, unowned);
+
+    const products = Object.entries(cartProducts)
+        .filter(([productId]) => plan.owners[productId] === profile)
+        .map(([productId, info]) => ({ productId, ...info, cost: estimateCost(info.optionCount) }));
+
+    const lost = (plan.assignments?.[profile] || []).filter(p => !cartProducts[p.productId]);
+    if (lost.length > 0) reassignLostProducts(profile, lost.map(p => p.productId));
+
+    return { products, plan };
+}
+
+/**
+ * 분배 결과 출력
+ */
+function printPlan(plan) {
+    console.log('\n=== 워치리스트 분배 ===');
+    for (const [account, products] of Object.entries(plan.assignments)) {
+        console.log(`  ${account}: ${products.length}개 상품 (비용 ${plan.loads[account].toFixed(2)})`);
+    }
+    if (plan.duplicates > 0) console.log(`  중복 상품 ${plan.duplicates}개는 한 계정에서만 조회`);
+    if (plan.missing.length > 0) console.log(`  장바구니에 없는 상품 ${plan.missing.length}개 (담기 필요): ${plan.missing.join(', ')}`);
+    console.log('======================\n');
+}
+
+// CLI 실행
+if (require.main === module) {
+    const [command, productId, ...memo] = process.argv.slice(2);
+    const watchlist = loadWatchlist();
+
+    if (command === 'add' && productId) {
+        watchlist.products[productId] = { ...(watchlist.products[productId] || {}), memo: memo.join(' ') };
+        saveWatchlist(watchlist);
+        console.log(`[워치리스트] ${productId} 추가 (총 ${Object.keys(watchlist.products).length}개)`);
+    } else if (command === 'remove' && productId) {
+        delete watchlist.products[productId];
+        saveWatchlist(watchlist);
+        console.log(`[워치리스트] ${productId} 삭제 (총 ${Object.keys(watchlist.products).length}개)`);
+    } else if (command === 'rebalance') {
+        printPlan(getPlan(listAccounts(USER_DATA_ROOT), true));
+    } else {
+        const plan = loadPlan();
+        if (!plan) {
+            console.log('[워치리스트] 저장된 분배 없음 (첫 --watchlist 실행 또는 rebalance 시 생성)');
+        } else {
+            console.log(`[워치리스트] 분배 생성 ${plan.createdAt}`);
+            printPlan(plan);
+        }
+    }
+}
+
+module.exports = {
+    USER_DATA_ROOT,
+    loadWatchlist,
+    saveWatchlist,
+    listAccounts,
+    saveCartSnapshot,
+    recordOptionCounts,
+    loadCartSnapshots,
+    assignProducts,
+    getPlan,
+    getAssignedProducts,
+    printPlan
+};